@@ -0,0 +1,50 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class TokenUser(BaseTokenUser):
+    # simplejwt 버전에 따라 user_id 클레임이 문자열로 저장되므로 User.pk와 같은 정수로 맞춘다
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    '''
+    JWT 인증 시 DB에서 User를 조회하지 않고 토큰 클레임(user_id, username)으로 TokenUser를 만든다.
+    auths.models.User 인스턴스가 필요한 뷰는 requires_full_user = True 로 설정한다.
+
+    class SomeView(APIView):
+        requires_full_user = True
+    '''
+    requires_full_user = False
+
+    def authenticate(self, request):
+        # 인증 클래스는 요청마다 새로 만들어지므로 뷰 설정을 인스턴스에 보관해도 안전하다
+        view = (request.parser_context or {}).get('view')
+        self.requires_full_user = getattr(view, 'requires_full_user', False)
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.requires_full_user:
+            return JWTAuthentication.get_user(self, validated_token)
+        return super().get_user(validated_token)
+
+
+def authenticate_token(request):
+    '''
+    DRF Request 없이 Authorization 헤더의 JWT로 TokenUser를 만든다. (async 뷰에서 사용)
+    헤더가 없으면 None, 토큰이 유효하지 않으면 AuthenticationFailed 를 발생시킨다.
+    '''
+    authentication = StatelessJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    return authentication.get_user(authentication.get_validated_token(raw_token))
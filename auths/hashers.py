@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    '''PASSWORD_HASHER_COST: 반복 횟수'''
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_COST or hashers.PBKDF2PasswordHasher.iterations
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    '''PASSWORD_HASHER_COST: time_cost (argon2-cffi 필요)'''
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHER_COST or hashers.Argon2PasswordHasher.time_cost
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    '''PASSWORD_HASHER_COST: rounds (log2, bcrypt 필요)'''
+    @property
+    def rounds(self):
+        return settings.PASSWORD_HASHER_COST or hashers.BCryptSHA256PasswordHasher.rounds
+
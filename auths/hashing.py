@@ -0,0 +1,35 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+
+
+def get_hashing_executor():
+    # 비밀번호 해싱(CPU 작업)만 실행하는 크기가 제한된 스레드 풀
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASHING_WORKERS,
+            thread_name_prefix='password-hashing',
+        )
+    return _executor
+
+
+def _call(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # 요청 스레드가 아니므로 request_finished 시점에 정리되지 않는 DB 연결을 직접 정리
+        close_old_connections()
+
+
+async def run_in_hashing_pool(func, *args, **kwargs):
+    '''
+    ASGI 이벤트 루프를 막지 않도록 func를 해싱 전용 스레드 풀에서 실행한다.
+    '''
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hashing_executor(), partial(_call, func, *args, **kwargs))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from auths.hashers import Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher
+
+HASHERS = {
+    'pbkdf2': PBKDF2PasswordHasher,
+    'argon2': Argon2PasswordHasher,
+    'bcrypt': BCryptSHA256PasswordHasher,
+}
+
+
+class Command(BaseCommand):
+    help = "hasher 설정별로 워커(스레드) 하나가 처리할 수 있는 초당 로그인(비밀번호 검증) 수를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--configs',
+            default='pbkdf2,pbkdf2:260000,pbkdf2:100000,argon2,bcrypt',
+            help='쉼표로 구분한 hasher[:cost] 목록 (cost 생략 시 Django 기본값)',
+        )
+        parser.add_argument('--seconds', type=float, default=3.0, help='설정별 측정 시간')
+
+    def handle(self, *args, **options):
+        for config in options['configs'].split(','):
+            name, _, cost = config.strip().partition(':')
+            if name not in HASHERS:
+                raise CommandError(f"알 수 없는 hasher입니다: {name} ({', '.join(HASHERS)})")
+
+            with override_settings(PASSWORD_HASHER_COST=int(cost) if cost else None):
+                try:
+                    rate = self.measure(HASHERS[name](), options['seconds'])
+                except ValueError as e:
+                    # argon2-cffi / bcrypt 미설치
+                    self.stdout.write(f"{config:<20} 건너뜀 - {e}")
+                    continue
+
+            self.stdout.write(f"{config:<20} {rate:>10,.1f} logins/s per worker")
+
+    def measure(self, hasher, seconds):
+        encoded = hasher.encode('devpassword1', hasher.salt())
+
+        count = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            hasher.verify('devpassword1', encoded)
+            count += 1
+        return count / (time.perf_counter() - started)
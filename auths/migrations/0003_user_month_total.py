@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:00
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+
+def backfill_totals(apps, schema_editor):
+    # 일별 집계로부터 유저별 총액과 이번 달 총액을 채운다 (합계 제외 지출 제외)
+    User = apps.get_model('auths', 'User')
+    DailySpendRollup = apps.get_model('expenditures', 'DailySpendRollup')
+
+    month = datetime.now().date().replace(day=1)
+    included = Sum(F('total') - F('excluded_total'))
+    totals = dict(DailySpendRollup.objects.values('user_id').annotate(spent=included).order_by().values_list('user_id', 'spent'))
+    month_totals = dict(
+        DailySpendRollup.objects.filter(day__gte=month)
+                                .values('user_id')
+                                .annotate(spent=included)
+                                .order_by()
+                                .values_list('user_id', 'spent')
+    )
+
+    User.objects.update(total=0, month_total=0, month_total_month=month)
+    for user_id, total in totals.items():
+        User.objects.filter(pk=user_id).update(total=total, month_total=month_totals.get(user_id, 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auths', '0002_alter_user_total'),
+        ('expenditures', '0006_is_except_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='month_total',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='month_total_month',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
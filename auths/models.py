@@ -7,4 +7,7 @@ class User(AbstractUser):
         max_length=128,
         unique=True,
     )  # 계정명
-    total = models.PositiveBigIntegerField(default=0)  # 총액
\ No newline at end of file
+    # 지출 합계 카운터 (합계 제외 지출 제외, expenditures.counters에서 관리)
+    total = models.PositiveBigIntegerField(default=0)  # 총액
+    month_total = models.PositiveBigIntegerField(default=0)  # month_total_month 월의 총액
+    month_total_month = models.DateField(null=True, blank=True)
@@ -17,6 +17,14 @@ class ValidationSerializer(ModelSerializer):
         if len(value) < 8:
             raise ValidationError("비밀번호는 최소 8자 이상이어야 합니다.")
         return value
+
+    def create(self, validated_data):
+        # 비밀번호를 해싱한 뒤 한 번만 저장
+        password = validated_data.pop("password")
+        user = User(**validated_data)
+        user.set_password(password)
+        user.save()
+        return user
     
     class Meta:
         model = User
@@ -1,3 +1,76 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from auths.models import User
+from auths.views import async_jwt_login
+
+
+class JWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post('/api/auths/jwt-login', {'username': 'user1', 'password': 'devpassword1'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}")
+
+    def test_authenticated_request_skips_user_lookup(self):
+        self.login()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/budgets//')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in context.captured_queries if 'auths_user' in query['sql']])
+
+    def test_requires_full_user_loads_user(self):
+        self.login()
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=self.client._credentials['HTTP_AUTHORIZATION'])
+
+        class FullUserView(APIView):
+            requires_full_user = True
+
+            def get(self, request):
+                return Response({'is_user': isinstance(request.user, User)})
+
+        self.assertTrue(FullUserView.as_view()(request).data['is_user'])
+
+    def test_requires_authentication(self):
+        response = self.client.get('/api/budgets//')
+
+        self.assertEqual(response.status_code, 401)
+
+
+class SignUpTest(TestCase):
+    def test_signup_hashes_password_in_single_write(self):
+        client = APIClient()
+
+        # username 중복 확인 + INSERT
+        with self.assertNumQueries(2):
+            response = client.post('/api/auths/signup', {'username': 'user1', 'password': 'devpassword1'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(username='user1').check_password('devpassword1'))
+
+
+class AsyncJWTLoginTest(TransactionTestCase):
+    # 해싱 스레드 풀은 별도 DB 연결을 사용하므로 테스트 트랜잭션으로 감싸지 않는다
+    def setUp(self):
+        User.objects.create_user(username='user1', password='devpassword1')
+
+    async def test_async_login(self):
+        factory = AsyncRequestFactory()
+        request = factory.post('/api/auths/jwt-login', {'username': 'user1', 'password': 'devpassword1'}, content_type='application/json')
+
+        response = await async_jwt_login(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', json.loads(response.content))
+
+        request = factory.post('/api/auths/jwt-login', {'username': 'user1', 'password': 'wrong'}, content_type='application/json')
+        self.assertEqual((await async_jwt_login(request)).status_code, 401)
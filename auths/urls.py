@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from auths import views
 
@@ -5,5 +6,5 @@ app_name = "auths"
 
 urlpatterns =[
     path("signup", views.SignUp.as_view()),
-    path("jwt-login", views.JWTLogin.as_view()),
+    path("jwt-login", views.async_jwt_login if settings.ASYNC_VIEWS else views.JWTLogin.as_view()),
 ]
\ No newline at end of file
@@ -1,8 +1,9 @@
+import json
 import jwt
 import requests
 from django.contrib.auth import authenticate, login, logout
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponseNotAllowed, JsonResponse
 
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -11,8 +12,23 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
 
+from auths.hashing import run_in_hashing_pool
 from auths.serializers import CreateUserSerializer, ValidationSerializer
 from auths.models import User
+from config.decorators import async_csrf_exempt
+
+LOGIN_PARSE_ERROR_MESSAGE = "잘못된 요청입니다. username, password 모두 존재해야합니다."
+LOGIN_FAILED_MESSAGE = "username 또는 password가 잘못되었습니다."
+
+
+def login_response_data(user):
+    refresh = RefreshToken.for_user(user)
+    refresh['username'] = user.username  # TokenUser.username (DB 조회 없는 인증용)
+    access_token = str(refresh.access_token)
+    return {
+        "username": user.username,
+        'access_token': access_token,
+    }
 
 
 class SignUp(APIView):
@@ -29,16 +45,13 @@ class SignUp(APIView):
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
-        print(request.data)
 
         if not username or not password:
             raise ParseError(detail="잘못된 요청입니다. username, password 모두 존재해야합니다.")
         
         serializer = ValidationSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
-            user.set_password(password)  # hashed password
-            user.save()
+            user = serializer.save()  # hashed password
 
             return Response(
                 CreateUserSerializer(user).data,
@@ -66,7 +79,7 @@ class JWTLogin(APIView):
         password = request.data.get("password")
 
         if not username or not password:
-            raise ParseError(detail="잘못된 요청입니다. username, password 모두 존재해야합니다.")
+            raise ParseError(detail=LOGIN_PARSE_ERROR_MESSAGE)
 
         user = authenticate(
             request, 
@@ -75,17 +88,47 @@ class JWTLogin(APIView):
         )
 
         if user is not None:
-            refresh = RefreshToken.for_user(user)
-            access_token = str(refresh.access_token)
             return Response(
-                {
-                    "username": user.username,
-                    'access_token': access_token,
-                },
+                login_response_data(user),
                 status=status.HTTP_200_OK,
             )
         else:
             return Response(
-                {"error": "username 또는 password가 잘못되었습니다."}, 
+                {"error": LOGIN_FAILED_MESSAGE}, 
                 status=status.HTTP_401_UNAUTHORIZED
-            )
\ No newline at end of file
+            )
+
+
+@async_csrf_exempt
+async def async_jwt_login(request):
+    '''
+    🔗 url: /auths/jwt-login (ASYNC_VIEWS=True)
+    ✅ JWT 로그인 (ASGI)
+    비밀번호 해싱을 해싱 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않는다.
+    '''
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return JsonResponse({"detail": "잘못된 JSON 요청입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    username = data.get("username")
+    password = data.get("password")
+
+    if not username or not password:
+        return JsonResponse({"detail": LOGIN_PARSE_ERROR_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
+
+    user = await run_in_hashing_pool(
+        authenticate,
+        request,
+        username=username,
+        password=password,
+    )
+
+    if user is not None:
+        return JsonResponse(login_response_data(user), status=status.HTTP_200_OK)
+    return JsonResponse({"error": LOGIN_FAILED_MESSAGE}, status=status.HTTP_401_UNAUTHORIZED)
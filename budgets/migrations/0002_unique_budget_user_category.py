@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 13:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_budgets(apps, schema_editor):
+    # (user, category)별로 가장 먼저 만들어진 예산만 남긴다
+    Budget = apps.get_model('budgets', 'Budget')
+    duplicates = (
+        Budget.objects.values('user_id', 'category_id')
+                      .annotate(first_id=Min('id'), budget_count=Count('id'))
+                      .filter(budget_count__gt=1)
+                      .order_by()
+    )
+    for duplicate in duplicates:
+        Budget.objects.filter(
+            user_id=duplicate['user_id'],
+            category_id=duplicate['category_id'],
+        ).exclude(id=duplicate['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('budgets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_budgets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='budget',
+            constraint=models.UniqueConstraint(fields=('user', 'category'), name='unique_budget_user_category'),
+        ),
+    ]
@@ -14,3 +14,8 @@ class Budget(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     category = models.ForeignKey('budgets.Category', on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_budget_user_category'),
+        ]
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg
+
+from budgets.models import Budget
+from budgets.registry import categories
+
+CATEGORY_RATIO_AVERAGES_KEY = 'budgets:category-ratio-averages'
+
+
+def compute_category_ratio_averages():
+    # 모든 유저의 카테고리별 예산 비율 평균을 한 번의 그룹 쿼리로 계산 (예산이 없는 카테고리는 0)
+    averages = dict(
+        Budget.objects.values('category_id')
+                      .annotate(average=Avg('ratio'))
+                      .order_by()
+                      .values_list('category_id', 'average')
+    )
+    return {
+        name: averages.get(id) or 0
+        for id, name in categories.names().items()
+    }
+
+
+def get_category_ratio_averages():
+    '''
+    미리 계산된 카테고리별 평균 비율을 반환한다.
+    예산이 저장되면 무효화되고, BUDGET_RATIO_CACHE_TIMEOUT 마다 다시 계산된다.
+    '''
+    averages = cache.get(CATEGORY_RATIO_AVERAGES_KEY)
+    if averages is None:
+        averages = compute_category_ratio_averages()
+        cache.set(CATEGORY_RATIO_AVERAGES_KEY, averages, settings.BUDGET_RATIO_CACHE_TIMEOUT)
+    return averages
+
+
+def invalidate_category_ratio_averages():
+    transaction.on_commit(lambda: cache.delete(CATEGORY_RATIO_AVERAGES_KEY))
@@ -0,0 +1,46 @@
+import threading
+
+from budgets.models import Category
+from config.cache import CATEGORY_VERSION_KEY, get_versions
+
+
+class CategoryRegistry:
+    '''
+    프로세스 안에서 재사용하는 카테고리 id <-> 이름 맵
+    처음 사용할 때 한 번 조회하고, 공유 캐시의 카테고리 버전(세대)이 바뀐 경우에만 다시 조회한다.
+    카테고리를 변경하는 곳에서는 config.cache.bump_category_version()을 호출해야 한다.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._names = {}  # id -> name (id 순)
+        self._ids = {}  # name -> id
+
+    def _load(self):
+        # 세대를 먼저 읽고 조회해야 조회 도중 변경이 생겨도 다음 접근에서 다시 읽는다
+        generation, = get_versions(CATEGORY_VERSION_KEY)
+        if generation == self._generation:
+            return self._names, self._ids
+
+        with self._lock:
+            if generation != self._generation:
+                names = dict(Category.objects.order_by('id').values_list('id', 'name'))
+                self._names = names
+                self._ids = {name: id for id, name in names.items()}
+                self._generation = generation
+        return self._names, self._ids
+
+    def names(self):
+        return self._load()[0]
+
+    def ids(self):
+        return self._load()[1]
+
+    def name(self, id):
+        return self.names().get(id)
+
+    def id(self, name):
+        return self.ids().get(name)
+
+
+categories = CategoryRegistry()
@@ -1,3 +1,51 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from auths.models import User
+from budgets.models import Category, Budget
+
+
+class BudgetRecommendationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for index in range(3):
+            user = User.objects.create_user(username=f'user{index}', password='devpassword1')
+            for name, ratio in [('식비', 40 + index), ('주거', 50 - index), ('교통', 5), ('기타', 5)]:
+                category, _ = Category.objects.get_or_create(name=name)
+                Budget.objects.create(user=user, category=category, ratio=ratio)
+        self.client.force_authenticate(user)
+
+    def test_recommendation(self):
+        response = self.client.post('/api/budgets/rec/', {'total_amount': 1000000}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'식비', '주거', '기타'})
+        self.assertEqual(response.data['식비']['amount'], 410000)
+        self.assertEqual(response.data['기타']['amount'], 100000)
+
+    def test_population_ratios_are_precomputed(self):
+        self.client.post('/api/budgets/rec/', {'total_amount': 1000000}, format='json')
+
+        with self.assertNumQueries(0):
+            self.client.post('/api/budgets/rec/', {'total_amount': 1000000}, format='json')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put('/api/budgets/rec/', {'budgets': {'식비': {'amount': 0, 'ratio': 100}}}, format='json')
+
+        response = self.client.post('/api/budgets/rec/', {'total_amount': 1000000}, format='json')
+        self.assertNotEqual(response.data['식비']['amount'], 410000)
+
+    def test_put_upserts_budgets_in_one_transaction(self):
+        user = User.objects.get(username='user2')
+        data = {'budgets': {'식비': {'amount': 300000, 'ratio': 30}, '여행': {'amount': 700000, 'ratio': 70}}}
+
+        # 카테고리 조회, 없는 카테고리 생성/재조회, 예산 upsert, 예산 스냅샷 지출 조회/upsert (+ savepoint)
+        with self.assertNumQueries(8):
+            response = self.client.put('/api/budgets/rec/', data, format='json')
+        self.client.put('/api/budgets/rec/', data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Budget.objects.filter(user=user, category__name='여행').count(), 1)
+        self.assertEqual(Budget.objects.get(user=user, category__name='식비').amount, 300000)
@@ -1,21 +1,31 @@
-from django.db.models import Sum
+from django.db import transaction
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from budgets.models import Category, Budget
+from budgets.registry import categories
+from budgets.ratios import get_category_ratio_averages, invalidate_category_ratio_averages
 from budgets.serializers import CategorySerializer
+from config.cache import bump_category_version, bump_user_version, cache_response, conditional_response
+from config.db import upsert
+from expenditures import budget_status
 
 class CategoryList(APIView):
+    @conditional_response('categories', per_user=False)
+    @cache_response('categories', per_user=False)
     def get(self, request):
-        categories = Category.objects.all()
-        serializer = CategorySerializer(categories, many=True)
-        return Response(serializer.data)
+        return Response([
+            {'id': id, 'name': name}
+            for id, name in categories.names().items()
+        ])
     
     def post(self, request):
         serializer = CategorySerializer(data=request.data)
 
         if serializer.is_valid():
             serializer.save()
+            bump_category_version()
+            invalidate_category_ratio_averages()
             return Response(
                 serializer.data, 
                 status=status.HTTP_201_CREATED
@@ -40,6 +50,8 @@ class CategoryList(APIView):
 
         if serializer.is_valid():
             serializer.save()
+            bump_category_version()
+            invalidate_category_ratio_averages()
             return Response(serializer.data)
 
         return Response(
@@ -70,15 +82,44 @@ class BudgetRecommendation(APIView):
     def put(self, request):
         # 수정된 예산 데이터 저장
         budgets = request.data.get('budgets', {})
-        for category, budget_info in budgets.items():
-            amount = budget_info.get('amount', 0)
-            ratio = budget_info.get('ratio', 0)
-            category_obj, created = Category.objects.get_or_create(name=category)
-            budget_obj, created = Budget.objects.get_or_create(user=request.user, category=category_obj)
-            budget_obj.amount = amount
-            budget_obj.ratio = ratio
-            budget_obj.save()
+        if not isinstance(budgets, dict) or not all(isinstance(info, dict) for info in budgets.values()):
+            return Response(
+                {'error': 'budgets는 {카테고리: {"amount", "ratio"}} 형식이어야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        with transaction.atomic():
+            # 카테고리 이름을 한 번에 조회하고 없는 카테고리만 생성
+            category_ids = categories.ids()
+            missing_names = [name for name in budgets if name not in category_ids]
+            if missing_names:
+                Category.objects.bulk_create(
+                    [Category(name=name) for name in missing_names],
+                    ignore_conflicts=True,
+                )
+                category_ids = {
+                    **category_ids,
+                    **dict(Category.objects.filter(name__in=missing_names).values_list('name', 'id')),
+                }
+
+            # (user, category) 기준으로 유저의 예산을 한 번에 upsert
+            new_budgets = [
+                Budget(
+                    user_id=request.user.pk,
+                    category_id=category_ids[category],
+                    amount=budget_info.get('amount', 0),
+                    ratio=budget_info.get('ratio', 0),
+                )
+                for category, budget_info in budgets.items()
+            ]
+            upsert(Budget, new_budgets, unique_fields=['user', 'category'], update_fields=['amount', 'ratio', 'updated_at'])
+            # 이번 달 예산 스냅샷의 예산도 함께 갱신
+            budget_status.sync_budgets(request.user.pk, {budget.category_id: budget.amount for budget in new_budgets})
+
+        if missing_names:
+            bump_category_version()
+        bump_user_version(request.user.pk)
+        invalidate_category_ratio_averages()
         return Response(
             {'message': 'Budgets updated successfully'}, 
             status=status.HTTP_200_OK
@@ -86,24 +127,15 @@ class BudgetRecommendation(APIView):
 
     def calculate_category_ratios(self):
         # 카테고리별 예산 비율을 계산하는 함수 (평균값 사용)
-        category_ratios = {}
-
-        # 모든 유저의 카테고리별 예산을 조회하여 평균 계산
-        all_users_budgets = Budget.objects.all()
-        total_ratio_sum = 0
-
-        for category in Category.objects.all():
-            category_budgets = all_users_budgets.filter(category=category)
-            category_ratio_sum = category_budgets.aggregate(Sum('ratio'))['ratio__sum'] or 0
-            category_ratio_avg = category_ratio_sum / category_budgets.count() if category_budgets.count() > 0 else 0
-            category_ratios[category.name] = category_ratio_avg
-            total_ratio_sum += category_ratio_avg
+        # 모든 유저의 카테고리별 예산 평균은 미리 계산된 값을 사용
+        category_ratios = dict(get_category_ratio_averages())
+        total_ratio_sum = sum(category_ratios.values())
 
         # 10% 이하의 카테고리들은 모두 묶어 기타로 설정
-        for category in Category.objects.all():
-            if category_ratios[category.name] < 10:
-                category_ratios['기타'] = category_ratios.get('기타', 0) + category_ratios[category.name]
-                del category_ratios[category.name]
+        for category_name, ratio in list(category_ratios.items()):
+            if category_name != '기타' and ratio < 10:
+                category_ratios['기타'] = category_ratios.get('기타', 0) + ratio
+                del category_ratios[category_name]
 
         # 기타 카테고리의 비율이 10% 미만이라면 0으로 설정
         category_ratios['기타'] = max(0, category_ratios.get('기타', 0))
@@ -113,4 +145,4 @@ class BudgetRecommendation(APIView):
             for category in category_ratios:
                 category_ratios[category] = (category_ratios[category] / total_ratio_sum) * 100
 
-        return category_ratios
\ No newline at end of file
+        return category_ratios
@@ -0,0 +1,180 @@
+import hashlib
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import wraps
+from zoneinfo import ZoneInfo
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.response import Response
+
+from config.metrics import record_cache
+from config.routers import pin_to_primary
+
+# 프로세스별 캐시 적중/미스 횟수 (namespace:hit / namespace:miss)
+stats = Counter()
+
+CATEGORY_VERSION_KEY = 'version:categories'
+
+
+def user_version_key(user_id):
+    return f'version:user:{user_id}'
+
+
+def now():
+    return datetime.now(ZoneInfo(settings.TIME_ZONE))
+
+
+def seconds_until_midnight():
+    # 날짜가 바뀌면 '오늘' 기준 응답이 모두 무효가 되므로 자정(Asia/Seoul)까지만 보관
+    current = now()
+    midnight = datetime.combine(current.date() + timedelta(days=1), datetime.min.time(), tzinfo=current.tzinfo)
+    return max(1, int((midnight - current).total_seconds()))
+
+
+def _new_version():
+    # 버전 키가 축출된 뒤 다시 만들어져도 예전 키와 겹치지 않도록 시각 기반 값 사용
+    return time.time_ns()
+
+
+def get_versions(*keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def bump_user_version(user_id):
+    '''
+    유저의 지출/예산이 바뀌면 호출한다. 트랜잭션 커밋 후 버전을 올려 캐시된 응답을 무효화한다.
+    복제본을 쓰는 경우 복제 지연 동안은 default에서 다시 계산하도록 유저를 고정한다.
+    '''
+    def bump():
+        pin_to_primary(user_id)
+        _bump(user_version_key(user_id))
+    transaction.on_commit(bump)
+
+
+def bump_category_version():
+    transaction.on_commit(lambda: _bump(CATEGORY_VERSION_KEY))
+
+
+def cache_key(namespace, user_id=None):
+    if user_id is None:
+        category_version, = get_versions(CATEGORY_VERSION_KEY)
+        return f'response:{namespace}:{category_version}'
+
+    user_version, category_version = get_versions(user_version_key(user_id), CATEGORY_VERSION_KEY)
+    return f'response:{namespace}:{user_id}:{now().date().isoformat()}:{user_version}:{category_version}'
+
+
+def cache_response(namespace, per_user=True):
+    '''
+    APIView 메서드의 200 응답 데이터를 캐시한다.
+    per_user=True 이면 유저/날짜/유저 버전별로, False 이면 카테고리 버전별로 키를 만든다.
+    '''
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            key = cache_key(namespace, request.user.pk if per_user else None)
+            data = cache.get(key)
+            if data is not None:
+                stats[f'{namespace}:hit'] += 1
+                record_cache(hit=True)
+                return Response(data)
+
+            stats[f'{namespace}:miss'] += 1
+            record_cache(hit=False)
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, seconds_until_midnight())
+            return response
+        return wrapper
+    return decorator
+
+
+def acache_response(namespace, per_user=True):
+    '''
+    cache_response의 async 버전. 응답 데이터를 반환하는 async 함수에 사용하며
+    동기 뷰와 같은 키를 쓰므로 캐시를 함께 사용한다.
+
+    @acache_response('recommendation')
+    async def get(request, user): ...
+    '''
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(request, user, *args, **kwargs):
+            key = await sync_to_async(cache_key)(namespace, user.pk if per_user else None)
+            data = await cache.aget(key)
+            if data is not None:
+                stats[f'{namespace}:hit'] += 1
+                record_cache(hit=True)
+                return data
+
+            stats[f'{namespace}:miss'] += 1
+            record_cache(hit=False)
+            data = await func(request, user, *args, **kwargs)
+            await cache.aset(key, data, seconds_until_midnight())
+            return data
+        return wrapper
+    return decorator
+
+
+def make_etag(namespace, request, user_id=None):
+    # 응답 캐시와 같은 버전 키에 쿼리 문자열을 더해 만든다. (DB 조회 없음)
+    key = cache_key(f'etag:{namespace}', user_id)
+    query = request.META.get('QUERY_STRING', '')
+    return quote_etag(hashlib.md5(f'{key}?{query}'.encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    # If-None-Match 약한 비교 (W/ 접두어 무시)
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    return '*' in etags or any(value.removeprefix('W/') == etag for value in etags)
+
+
+def set_etag(response, etag, per_user=True):
+    response['ETag'] = etag
+    if per_user:
+        patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def not_modified(namespace, etag, per_user=True):
+    stats[f'{namespace}:not_modified'] += 1
+    return set_etag(HttpResponseNotModified(), etag, per_user)
+
+
+def conditional_response(namespace, per_user=True):
+    '''
+    APIView 메서드의 200 응답에 ETag를 붙이고, If-None-Match가 같으면 뷰를 실행하지 않고 304를 반환한다.
+    ETag는 유저/카테고리 버전이 바뀌면(쓰기 커밋 후) 달라진다.
+    '''
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            etag = make_etag(namespace, request, request.user.pk if per_user else None)
+            if etag_matches(request, etag):
+                return not_modified(namespace, etag, per_user)
+
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                set_etag(response, etag, per_user)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,16 @@
+from django.db import connections, router
+
+
+def upsert(model, objs, unique_fields, update_fields):
+    '''
+    objs를 한 번의 INSERT ... ON CONFLICT(ON DUPLICATE KEY) UPDATE로 저장한다.
+    unique_fields의 유니크 제약과 겹치는 행은 update_fields만 갱신한다.
+    '''
+    connection = connections[router.db_for_write(model)]
+    return model.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        update_fields=update_fields,
+        # MySQL은 ON DUPLICATE KEY UPDATE 대상 컬럼을 지정하지 않는다
+        unique_fields=unique_fields if connection.features.supports_update_conflicts_with_target else None,
+    )
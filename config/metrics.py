@@ -0,0 +1,260 @@
+import ipaddress
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger('metrics')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+# 현재 요청의 측정값 (sync_to_async 스레드에도 전달된다)
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    '''
+    프로세스별 요청 측정값. gunicorn 워커마다 따로 집계되므로 수집기에서 워커별로 합산한다.
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = defaultdict(int)
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.query_count = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+        self.db_seconds = defaultdict(float)
+        self.response_bytes = defaultdict(int)
+        self.cache = defaultdict(int)
+        self.query_budget_exceeded = defaultdict(int)
+
+    def record(self, view, method, status, elapsed, metrics, size, over_budget=False):
+        with self.lock:
+            self.requests[(view, method, status)] += 1
+            self.latency[view].observe(elapsed)
+            self.query_count[view].observe(metrics.queries)
+            self.db_seconds[view] += metrics.db_time
+            self.response_bytes[view] += size
+            self.cache[(view, 'hit')] += metrics.cache_hits
+            self.cache[(view, 'miss')] += metrics.cache_misses
+            if over_budget:
+                self.query_budget_exceeded[view] += 1
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, help):
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def histogram(name, help, histograms):
+            family(name, 'histogram', help)
+            for view, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{view="{view}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{view="{view}"}} {cumulative}')
+
+        with self.lock:
+            family('http_requests_total', 'counter', '뷰/메서드/상태 코드별 요청 수')
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}')
+
+            histogram('http_request_duration_seconds', '요청 처리 시간', self.latency)
+            histogram('http_request_db_queries', '요청당 DB 쿼리 수', self.query_count)
+
+            family('http_request_db_seconds_total', 'counter', 'DB 쿼리 실행 시간 합계')
+            for view, seconds in sorted(self.db_seconds.items()):
+                lines.append(f'http_request_db_seconds_total{{view="{view}"}} {seconds}')
+
+            family('http_response_bytes_total', 'counter', '응답 크기 합계 (스트리밍 응답 제외)')
+            for view, size in sorted(self.response_bytes.items()):
+                lines.append(f'http_response_bytes_total{{view="{view}"}} {size}')
+
+            family('http_request_cache_total', 'counter', '뷰별 응답 캐시 적중/미스 수')
+            for (view, result), count in sorted(self.cache.items()):
+                lines.append(f'http_request_cache_total{{view="{view}",result="{result}"}} {count}')
+
+            family('http_request_query_budget_exceeded_total', 'counter', '쿼리 수 한도(뷰의 query_budget 또는 METRICS_QUERY_COUNT_THRESHOLD)를 넘은 요청 수')
+            for view, count in sorted(self.query_budget_exceeded.items()):
+                lines.append(f'http_request_query_budget_exceeded_total{{view="{view}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def query_budget(request):
+    '''
+    요청의 쿼리 수 한도. 뷰(APIView 클래스 또는 함수)의 query_budget 속성을 따르고 없으면 METRICS_QUERY_COUNT_THRESHOLD
+    query_budget = 16                     # 모든 메서드
+    query_budget = {'PUT': 24}            # 메서드별 (없는 메서드는 기본값)
+    query_budget = None                   # 확인하지 않음 (입력 크기에 비례하는 일괄 처리 등)
+    '''
+    func = getattr(request.resolver_match, 'func', None)
+    budget = getattr(getattr(func, 'view_class', func), 'query_budget', settings.METRICS_QUERY_COUNT_THRESHOLD)
+    if isinstance(budget, dict):
+        return budget.get(request.method, settings.METRICS_QUERY_COUNT_THRESHOLD)
+    return budget
+
+
+def record_cache(hit):
+    # config.cache의 응답 캐시에서 호출
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+def _install_query_wrapper(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class MetricsMiddleware:
+    '''
+    뷰별 응답 시간, DB 쿼리 수/시간, 응답 크기, 응답 캐시 적중을 집계한다. (/metrics 에서 조회)
+    쿼리 수가 뷰의 한도(query_budget 참고)를 넘으면 경고 로그를 남기고,
+    METRICS_LOG_REQUESTS=True 이면 모든 요청을 JSON 한 줄로 기록한다.
+    '''
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+        # 스레드마다 만들어지는 연결 모두에 쿼리 측정 래퍼를 건다
+        connection_created.connect(_install_query_wrapper, dispatch_uid='metrics_query_wrapper')
+        for connection in connections.all(initialized_only=True):
+            _install_query_wrapper(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics, start = RequestMetrics(), time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        metrics, start = RequestMetrics(), time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    def finish(self, request, response, metrics, elapsed):
+        match = request.resolver_match
+        # URL 패턴 단위로 집계해 레이블 수가 늘어나지 않게 한다
+        view = match.route if match else 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+        method = request.method if request.method in METHODS else 'OTHER'
+        budget = query_budget(request)
+        over_budget = budget is not None and metrics.queries > budget
+        registry.record(view, method, response.status_code, elapsed, metrics, size, over_budget)
+
+        record = {
+            'view': view,
+            'method': method,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 2),
+            'db_queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'response_bytes': size,
+            'cache_hits': metrics.cache_hits,
+            'cache_misses': metrics.cache_misses,
+        }
+        if over_budget:
+            logger.warning(json.dumps({'event': 'query_budget_exceeded', 'query_budget': budget, **record}))
+        elif settings.METRICS_LOG_REQUESTS:
+            logger.info(json.dumps(record))
+
+
+def metrics_allowed(request):
+    # METRICS_ALLOWED_IPS(IP 또는 CIDR 목록)에 있는 주소에서만 조회할 수 있다
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+
+def metrics_view(request):
+    '''
+    🔗 url: /metrics
+    ✅ Prometheus 텍스트 형식의 요청 측정값 (METRICS_ALLOWED_IPS에서만)
+    '''
+    if not metrics_allowed(request):
+        raise Http404
+    # 순환 import를 피하기 위해 여기서 가져온다
+    from config.cache import stats
+
+    body = registry.render()
+    lines = ['# HELP response_cache_total 응답 캐시 namespace별 적중/미스 수', '# TYPE response_cache_total counter']
+    for key, count in sorted(stats.items()):
+        namespace, result = key.rsplit(':', 1)
+        lines.append(f'response_cache_total{{namespace="{namespace}",result="{result}"}} {count}')
+    body += '\n'.join(lines) + '\n'
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
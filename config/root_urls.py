@@ -4,6 +4,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from config.metrics import metrics_view
+
 
 # schema_view = get_schema_view(
 #     openapi.Info(
@@ -24,6 +26,7 @@ urlpatterns = [
 
     # [end-point]
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view),
     path('api/auths/', include('auths.urls')),
     path('api/budgets/', include('budgets.urls')),
     path('api/expenditures/', include('expenditures.urls')),
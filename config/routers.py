@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import cache
+
+# 현재 요청(또는 코루틴)이 복제본에서 읽어도 되는지 여부
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def primary_pin_key(user_id):
+    return f'replica:pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    '''
+    유저가 지출/예산을 쓴 직후 DATABASE_REPLICA_LAG 동안은 default에서 읽게 한다.
+    복제 지연으로 방금 쓴 데이터가 빠진 응답이 캐시되는 것을 막는다.
+    '''
+    if settings.DATABASE_REPLICA:
+        cache.set(primary_pin_key(user_id), True, settings.DATABASE_REPLICA_LAG)
+
+
+@contextmanager
+def read_from_replica(pinned=False):
+    if not settings.DATABASE_REPLICA or pinned:
+        yield
+        return
+
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def use_replica(func):
+    '''
+    읽기 전용 집계 뷰의 조회를 복제본으로 보낸다.
+    APIView 메서드 (view, request, ...)와 async 뷰 함수 (request, user, ...) 모두에 사용한다.
+    '''
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(request, user, *args, **kwargs):
+            pinned = settings.DATABASE_REPLICA and await cache.aget(primary_pin_key(user.pk))
+            with read_from_replica(pinned):
+                return await func(request, user, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(view, request, *args, **kwargs):
+        pinned = settings.DATABASE_REPLICA and cache.get(primary_pin_key(request.user.pk))
+        with read_from_replica(pinned):
+            return func(view, request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    '''
+    read_from_replica 안의 조회만 복제본으로 보내고 나머지는 default를 사용한다.
+    '''
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICA and _read_from_replica.get():
+            return settings.DATABASE_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.DATABASE_REPLICA
@@ -1,7 +1,11 @@
 from pathlib import Path
 import os
+import sys
 import environ
 from datetime import timedelta
+from importlib.util import find_spec
+
+from django.core.exceptions import ImproperlyConfigured
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -44,6 +48,7 @@ INSTALLED_APPS = SYSTEM_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
 
 MIDDLEWARE = [
+    'config.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,8 +78,24 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# ASGI로 실행할 때 async 뷰를 URL에 연결
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+
 
 # Database
+# DB_CONN_MAX_AGE: 연결 재사용 시간(초). ASGI에서는 요청마다 스레드가 달라 연결이 쌓이므로 기본값 0
+# DB_CONN_HEALTH_CHECKS: 재사용 전 연결이 살아 있는지 확인
+# DB_POOL_SIZE: 0보다 크면 django-db-connection-pool(dj_db_conn_pool)의 커넥션 풀 사용
+DB_CONN_MAX_AGE = env.int("DB_CONN_MAX_AGE", default=0 if ASYNC_VIEWS else 60)
+
+DB_CONN_HEALTH_CHECKS = env.bool("DB_CONN_HEALTH_CHECKS", default=True)
+
+DB_POOL_SIZE = env.int("DB_POOL_SIZE", default=0)
+
+DB_POOL_MAX_OVERFLOW = env.int("DB_POOL_MAX_OVERFLOW", default=10)
+
+DB_POOL_RECYCLE = env.int("DB_POOL_RECYCLE", default=60 * 60)
+
 MYSQL_DB = env('MYSQL_DB')
 if MYSQL_DB:
     DATABASES = {
@@ -85,8 +106,39 @@ if MYSQL_DB:
             'PASSWORD': env("DB_PASSWORD"),
             'HOST': env("DB_HOST"),
             'PORT': env("DB_PORT"),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
         },
     }
+    if DB_POOL_SIZE:
+        # 선택 의존성 (pip install django-db-connection-pool[mysql])
+        if find_spec('dj_db_conn_pool') is None:
+            raise ImproperlyConfigured(
+                "DB_POOL_SIZE를 사용하려면 django-db-connection-pool[mysql] 패키지를 설치해야 합니다."
+            )
+        # 풀이 연결 수명을 관리하므로 Django의 지속 연결은 사용하지 않는다
+        DATABASES['default'].update({
+            'ENGINE': 'dj_db_conn_pool.backends.mysql',
+            'CONN_MAX_AGE': 0,
+            'POOL_OPTIONS': {
+                'POOL_SIZE': DB_POOL_SIZE,
+                'MAX_OVERFLOW': DB_POOL_MAX_OVERFLOW,
+                'RECYCLE': DB_POOL_RECYCLE,
+            },
+        })
+
+    # MySQL은 부분 인덱스(Index.condition)를 지원하지 않아 만들지 않으므로 경고를 끈다
+    SILENCED_SYSTEM_CHECKS = ['models.W037']
+
+    # 읽기 전용 복제본 (DB_REPLICA_HOST가 있을 때만, 나머지 설정은 default와 같다)
+    DB_REPLICA_HOST = env("DB_REPLICA_HOST", default=None)
+    if DB_REPLICA_HOST:
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': DB_REPLICA_HOST,
+            'PORT': env("DB_REPLICA_PORT", default=env("DB_PORT")),
+            'TEST': {'MIRROR': 'default'},
+        }
 else:
     DATABASES = {
         'default': {
@@ -94,6 +146,41 @@ else:
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
+    # 로컬에서 라우터를 확인할 때 같은 파일을 복제본으로 사용
+    if env.bool("DB_REPLICA", default=False):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'TEST': {'MIRROR': 'default'},
+        }
+
+# 집계 API 조회를 복제본으로 보낸다 (config.routers 참고)
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+
+DATABASE_REPLICA = 'replica' if 'replica' in DATABASES else None
+
+# 지출/예산을 쓴 유저는 이 시간(초) 동안 복제본 대신 default에서 읽는다 (복제 지연 대비)
+DATABASE_REPLICA_LAG = env.int("DATABASE_REPLICA_LAG", default=5)
+
+
+# Password hashing (pbkdf2 | argon2 | bcrypt)
+# PASSWORD_HASHER_COST: pbkdf2 반복 횟수 / argon2 time_cost / bcrypt rounds (없으면 Django 기본값)
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="pbkdf2")
+
+PASSWORD_HASHER_COST = env.int("PASSWORD_HASHER_COST", default=None)
+
+# 선택한 hasher로 새 비밀번호를 해싱하고, 나머지는 기존 해시 검증용으로 남긴다
+_PASSWORD_HASHERS = {
+    "pbkdf2": "auths.hashers.PBKDF2PasswordHasher",
+    "argon2": "auths.hashers.Argon2PasswordHasher",
+    "bcrypt": "auths.hashers.BCryptSHA256PasswordHasher",
+}
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+# ASGI 로그인 시 비밀번호 해싱을 실행할 스레드 수
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=4)
 
 
 # Password validation
@@ -138,3 +225,81 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Customizing User model
 AUTH_USER_MODEL = "auths.User"
+
+
+# Django-Rest-Framework
+REST_FRAMEWORK = {
+    # 토큰 클레임으로 유저를 만들어 요청마다 User를 조회하지 않는다 (auths.authentication 참고)
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'auths.authentication.StatelessJWTAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
+}
+
+SIMPLE_JWT = {
+    'TOKEN_USER_CLASS': 'auths.authentication.TokenUser',
+}
+
+
+# Expenditure list pagination / streaming
+EXPENDITURE_PAGE_SIZE = env.int("EXPENDITURE_PAGE_SIZE", default=100)
+
+EXPENDITURE_MAX_PAGE_SIZE = env.int("EXPENDITURE_MAX_PAGE_SIZE", default=1000)
+
+EXPENDITURE_STREAM_CHUNK_SIZE = env.int("EXPENDITURE_STREAM_CHUNK_SIZE", default=2000)
+
+EXPENDITURE_IMPORT_CHUNK_SIZE = env.int("EXPENDITURE_IMPORT_CHUNK_SIZE", default=1000)
+
+
+# Population budget ratio averages (BudgetRecommendation)
+BUDGET_RATIO_CACHE_TIMEOUT = env.int("BUDGET_RATIO_CACHE_TIMEOUT", default=60 * 60)
+
+
+# Request metrics (config.metrics, /metrics)
+# 요청당 쿼리 수가 이 값을 넘으면 경고 로그를 남긴다 (뷰의 query_budget 속성이 있으면 그 값을 사용)
+METRICS_QUERY_COUNT_THRESHOLD = env.int("METRICS_QUERY_COUNT_THRESHOLD", default=10)
+
+# 모든 요청의 측정값을 JSON 한 줄로 기록
+METRICS_LOG_REQUESTS = env.bool("METRICS_LOG_REQUESTS", default=False)
+
+# /metrics 를 조회할 수 있는 주소 (IP 또는 CIDR, 쉼표로 구분). 그 외에는 404
+METRICS_ALLOWED_IPS = env.list("METRICS_ALLOWED_IPS", default=['127.0.0.1', '::1'])
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
+# Cache (REDIS_URL이 없거나 테스트 실행 시 로컬 메모리 캐시 사용)
+REDIS_URL = env("REDIS_URL", default=None)
+if REDIS_URL and 'test' not in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
@@ -0,0 +1,49 @@
+from django.db.models import F, Q, Sum
+
+from expenditures.models import DailySpendRollup, Expenditure
+
+# 일별 집계 한 행에서 합계 제외(is_except) 지출을 뺀 금액
+ROLLUP_INCLUDED_AMOUNT = F('total') - F('excluded_total')
+
+
+def spend_sums(model, included='spent', excluded='excluded_spent'):
+    '''
+    Expenditure 또는 DailySpendRollup 쿼리셋의 annotate/aggregate 인자를 만든다.
+    included: 합계 제외(is_except)가 아닌 지출 합계, excluded: 합계 제외 지출 합계 (None이면 생략)
+    '''
+    if model is DailySpendRollup:
+        sums = {included: Sum(ROLLUP_INCLUDED_AMOUNT)}
+        if excluded:
+            sums[excluded] = Sum('excluded_total')
+        return sums
+
+    if not excluded:
+        # 포함 합계만 필요하면 spend_totals가 WHERE is_except = false 로 거른다 (부분 인덱스 사용)
+        return {included: Sum('expense_amount')}
+    return {
+        included: Sum('expense_amount', filter=Q(is_except=False)),
+        excluded: Sum('expense_amount', filter=Q(is_except=True)),
+    }
+
+
+def spend_totals(queryset, *group_by, included='spent', excluded='excluded_spent'):
+    '''
+    지출 합계를 한 번의 쿼리로 계산한다. 모든 합계는 이 함수(또는 spend_sums)를 거친다.
+    group_by가 있으면 그룹별 values 쿼리셋, 없으면 aggregate 결과(dict)를 반환한다.
+
+    spend_totals(expenditures, 'category__name', included='category_total', excluded='excluded_total')
+    spend_totals(rollups, 'category_id', included='category_total', excluded=None)
+    '''
+    if queryset.model is Expenditure and not excluded:
+        queryset = queryset.filter(is_except=False)
+    sums = spend_sums(queryset.model, included, excluded)
+    if group_by:
+        return queryset.values(*group_by).annotate(**sums).order_by()
+    return queryset.aggregate(**sums)
+
+
+async def aspend_totals(queryset, included='spent', excluded='excluded_spent'):
+    # group_by 없는 spend_totals의 async 버전
+    if queryset.model is Expenditure and not excluded:
+        queryset = queryset.filter(is_except=False)
+    return await queryset.aaggregate(**spend_sums(queryset.model, included, excluded))
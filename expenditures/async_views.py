@@ -0,0 +1,129 @@
+import asyncio
+from functools import wraps
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.http.response import HttpResponseBase
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+
+from auths.authentication import authenticate_token
+from config.cache import acache_response, etag_matches, make_etag, not_modified, set_etag
+from config.decorators import async_csrf_exempt
+from config.routers import use_replica
+from expenditures import views
+from expenditures.filters import build_totals, category_totals_queryset, filter_expenditures
+from expenditures.notifications import anotify_today
+from expenditures.pagination import apaginate, get_page_size
+from expenditures.recommendations import arecommend_today
+from expenditures.serializers import ExpenditureRowSerializer
+
+
+def render(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def async_api_view(sync_view, etag=None):
+    '''
+    GET 요청을 async 함수로 처리하고 그 외 메서드는 기존 APIView(sync_view)에 위임한다.
+    get(request, user, ...)은 응답 데이터 또는 HttpResponse를 반환한다.
+    etag: 조건부 GET에 쓸 namespace (동기 뷰의 conditional_response와 같은 값)
+    '''
+    def decorator(get):
+        @wraps(get)
+        async def view(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            try:
+                # 토큰 클레임만 사용하므로 DB 조회 없이 인증
+                user = authenticate_token(request)
+                if user is None:
+                    raise exceptions.NotAuthenticated()
+                if etag:
+                    tag = await sync_to_async(make_etag)(etag, request, user.pk)
+                    if etag_matches(request, tag):
+                        return not_modified(etag, tag)
+                data = await get(request, user, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return render({'detail': exc.detail}, status=exc.status_code)
+
+            response = data if isinstance(data, HttpResponseBase) else render(data)
+            if etag and response.status_code == 200 and not response.has_header('ETag'):
+                set_etag(response, tag)
+            return response
+
+        # 위임한 메서드의 쿼리 수 한도는 동기 뷰를 따른다 (config.metrics.query_budget)
+        if hasattr(sync_view.view_class, 'query_budget'):
+            view.query_budget = sync_view.view_class.query_budget
+        return async_csrf_exempt(view)
+    return decorator
+
+
+async def category_totals_list(expenditures):
+    return [item async for item in category_totals_queryset(expenditures)]
+
+
+expenditure_list_view = views.ExpenditureList.as_view()
+
+
+@async_api_view(expenditure_list_view, etag='expenditures')
+async def expenditure_list(request, user):
+    '''
+    🔗 url: /expenditures/ (ASYNC_VIEWS=True)
+    ✅ 지출 목록 조회 (ASGI)
+    합계와 페이지 쿼리를 함께 기다리지만 async ORM 호출은 thread_sensitive 스레드 하나에서
+    차례로 실행되므로 병렬로 실행되지는 않는다. stream=ndjson 요청은 동기 뷰에서 처리한다.
+    '''
+    if request.GET.get('stream', None) == 'ndjson':
+        return await sync_to_async(expenditure_list_view)(request)
+
+    expenditures = filter_expenditures(user.pk, request.GET)
+    cursor = request.GET.get('cursor', None)
+
+    # 합계는 첫 페이지에서만 한 번 계산
+    with_totals = request.GET.get('totals', 'true').lower() != 'false' and not cursor
+    page_task = apaginate(
+        ExpenditureRowSerializer.values(expenditures),
+        cursor,
+        get_page_size(request.GET),
+        key=itemgetter(1, 0),
+    )
+    if with_totals:
+        (page, next_cursor), category_totals = await asyncio.gather(
+            page_task,
+            category_totals_list(expenditures),
+        )
+    else:
+        page, next_cursor = await page_task
+
+    data = {
+        'expenditures': ExpenditureRowSerializer(page).data,
+        'next_cursor': next_cursor,
+    }
+    if with_totals:
+        data.update(build_totals(category_totals))
+    return data
+
+
+@async_api_view(views.TodayRecommendation.as_view())
+@use_replica
+@acache_response('recommendation')
+async def today_recommendation(request, user):
+    '''
+    🔗 url: /expenditures/rec/ (ASYNC_VIEWS=True)
+    ✅ 오늘 지출 추천 (ASGI)
+    '''
+    return await arecommend_today(user.pk)
+
+
+@async_api_view(views.NotiTodayExpenditure.as_view(), etag='noti')
+@use_replica
+@acache_response('noti')
+async def noti_today_expenditure(request, user):
+    '''
+    🔗 url: /expenditures/noti/ (ASYNC_VIEWS=True)
+    ✅ 오늘 지출 안내 (ASGI)
+    '''
+    return await anotify_today(user.pk)
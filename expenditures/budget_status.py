@@ -0,0 +1,190 @@
+import calendar
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F
+
+from budgets.models import Budget
+from config.db import upsert
+from expenditures.aggregates import spend_totals
+from expenditures.models import DailySpendRollup, MonthlyBudgetStatus
+from expenditures.statistics import month_range
+
+
+# 배치 API 한 번에 조회할 수 있는 유저 수
+MAX_BATCH_USERS = 1000
+
+
+def current_month():
+    return datetime.now().date().replace(day=1)
+
+
+def appropriate_and_danger(budget, spent, today):
+    '''
+    오늘까지 쓰기에 적정한 금액과 적정 금액 대비 초과 비율(%)을 계산한다.
+    예산이 없으면 둘 다 0
+    '''
+    if not budget:
+        return 0, 0
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+    appropriate = budget * today.day / days_in_month
+    return appropriate, (spent - appropriate) / appropriate * 100
+
+
+def compute_month(month, user_ids=None, keys=(), batch_size=1000):
+    '''
+    유저들의 해당 월 스냅샷 값을 예산과 일별 집계로부터 계산한다. (쓰기 없음)
+    {(user_id, category_id): [budget, spent]} 를 반환한다.
+    keys: 예산과 지출이 없어도 값을 만들 (user_id, category_id) 목록
+    '''
+    budgets = Budget.objects.all()
+    rollups = DailySpendRollup.objects.filter(day__range=month_range(month))
+    if user_ids is not None:
+        budgets = budgets.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    statuses = {key: [0, 0] for key in keys}
+    for user_id, category_id, amount in budgets.values_list('user_id', 'category_id', 'amount').iterator(chunk_size=batch_size):
+        statuses[(user_id, category_id)] = [amount, 0]
+    spent = spend_totals(rollups, 'user_id', 'category_id', excluded=None).values_list('user_id', 'category_id', 'spent')
+    for user_id, category_id, total in spent.iterator(chunk_size=batch_size):
+        statuses.setdefault((user_id, category_id), [0, 0])[1] = total
+    return statuses
+
+
+def initialize_month(month, user_ids=None, keys=(), batch_size=1000):
+    '''
+    유저들의 해당 월 스냅샷 행을 만든다. 이미 있는 행은 그대로 둔다.
+    user_ids가 없으면 예산 또는 지출이 있는 모든 유저를 대상으로 한다. (월 초 롤오버)
+    '''
+    statuses = compute_month(month, user_ids, keys, batch_size)
+    MonthlyBudgetStatus.objects.bulk_create(
+        [
+            MonthlyBudgetStatus(user_id=user_id, category_id=category_id, month=month, budget=budget, spent_to_date=spent)
+            for (user_id, category_id), (budget, spent) in statuses.items()
+        ],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    return len(statuses)
+
+
+def prepare_spend(keys):
+    '''
+    (user_id, category_id, day) 집계가 바뀌기 전에 호출한다.
+    이번 달 스냅샷 행이 없는 유저는 현재 일별 집계로 이번 달 행을 먼저 만들어
+    이후 apply_spend가 더하는 증감분과 겹치지 않게 한다.
+    '''
+    month = current_month()
+    user_ids = {user_id for user_id, _, day in keys if day.replace(day=1) == month}
+    if not user_ids:
+        return
+
+    existing = set(
+        MonthlyBudgetStatus.objects.filter(user_id__in=user_ids, month=month).values_list('user_id', 'category_id')
+    )
+    missing = {
+        (user_id, category_id)
+        for user_id, category_id, day in keys
+        if day.replace(day=1) == month and (user_id, category_id) not in existing
+    }
+    if missing:
+        initialize_month(month, user_ids={user_id for user_id, _ in missing}, keys=missing)
+
+
+def apply_spend(deltas):
+    # (user_id, category_id, day) -> 지출 합계(합계 제외 지출 제외) 증감분 중 이번 달 분만 스냅샷에 반영
+    month = current_month()
+    totals = {}
+    for (user_id, category_id, day), total in deltas.items():
+        if day.replace(day=1) == month and total:
+            totals[(user_id, category_id)] = totals.get((user_id, category_id), 0) + total
+
+    for (user_id, category_id), total in totals.items():
+        MonthlyBudgetStatus.objects.filter(user_id=user_id, category_id=category_id, month=month).update(
+            spent_to_date=F('spent_to_date') + total,
+        )
+
+
+def sync_budgets(user_id, budgets):
+    '''
+    유저의 예산({category_id: amount})이 바뀐 뒤 이번 달 스냅샷의 예산을 맞춘다. (같은 트랜잭션에서 호출)
+    새로 만들어지는 행의 지출 합계는 일별 집계에서 가져온다.
+    '''
+    month = current_month()
+    spent = dict(
+        spend_totals(
+            DailySpendRollup.objects.filter(user_id=user_id, day__range=month_range(month), category_id__in=budgets),
+            'category_id',
+            excluded=None,
+        ).values_list('category_id', 'spent')
+    )
+    upsert(
+        MonthlyBudgetStatus,
+        [
+            MonthlyBudgetStatus(
+                user_id=user_id,
+                category_id=category_id,
+                month=month,
+                budget=amount,
+                spent_to_date=spent.get(category_id, 0),
+            )
+            for category_id, amount in budgets.items()
+        ],
+        unique_fields=['user', 'category', 'month'],
+        update_fields=['budget'],
+    )
+
+
+def rebuild_month(month=None, user=None, user_ids=None):
+    '''
+    해당 월(기본값: 이번 달)의 스냅샷을 예산과 일별 집계로부터 다시 만든다. (백필 / 불일치 복구용)
+    user 또는 user_ids가 주어지면 해당 유저의 스냅샷만 다시 만든다.
+    '''
+    month = month or current_month()
+    if user is not None:
+        user_ids = [user.pk]
+    with transaction.atomic():
+        statuses = MonthlyBudgetStatus.objects.filter(month=month)
+        if user_ids is not None:
+            statuses = statuses.filter(user_id__in=user_ids)
+        statuses.delete()
+        return initialize_month(month, user_ids=user_ids)
+
+
+def get_statuses(user_ids, month=None):
+    '''
+    유저별 해당 월 스냅샷을 {user_id: {category_id: (budget, spent_to_date)}} 로 반환한다.
+    스냅샷이 없는 유저(월이 바뀐 뒤 아직 롤오버 전)는 예산과 일별 집계로 값만 계산한다.
+    조회 경로(복제본, 응답 캐시)에서 쓰이므로 행을 만들지 않는다. 행은 쓰기 경로(prepare_spend, sync_budgets)와
+    월 초 roll_budget_status 명령에서 만든다.
+    '''
+    month = month or current_month()
+    rows = MonthlyBudgetStatus.objects.filter(user_id__in=user_ids, month=month).values_list(
+        'user_id', 'category_id', 'budget', 'spent_to_date',
+    )
+    statuses = {user_id: {} for user_id in user_ids}
+    for user_id, category_id, budget, spent in rows:
+        statuses[user_id][category_id] = (budget, spent)
+
+    missing = [user_id for user_id, categories in statuses.items() if not categories]
+    if missing:
+        for (user_id, category_id), (budget, spent) in compute_month(month, user_ids=missing).items():
+            statuses[user_id][category_id] = (budget, spent)
+    return statuses
+
+
+def status_rows(statuses, category_names, today):
+    # {category_id: (budget, spent)} -> 카테고리 별 스냅샷 목록 (배치 API 응답용)
+    rows = []
+    for category_id, (budget, spent) in sorted(statuses.items()):
+        appropriate, danger = appropriate_and_danger(budget, spent, today)
+        rows.append({
+            'category_id': category_id,
+            'category_name': category_names.get(category_id),
+            'budget': budget,
+            'spent_to_date': spent,
+            'appropriate_to_date': appropriate,
+            'danger_pct': danger,
+        })
+    return rows
@@ -0,0 +1,87 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, OuterRef, Subquery, When
+from django.db.models.functions import Coalesce
+
+from auths.models import User
+from expenditures.aggregates import spend_totals
+from expenditures.budget_status import current_month
+from expenditures.models import DailySpendRollup
+from expenditures.statistics import month_range
+
+
+def month_spent(month, user_ids=None):
+    # 유저별 해당 월 지출 합계 (합계 제외 지출 제외)
+    rollups = DailySpendRollup.objects.filter(day__range=month_range(month))
+    if user_ids is not None:
+        rollups = rollups.filter(user_id__in=user_ids)
+    return spend_totals(rollups, 'user_id', excluded=None)
+
+
+def apply_counters(deltas):
+    '''
+    (user_id, category_id, day) -> [합계, 건수, 합계 제외 합계] 증감분을 User.total / month_total에 반영한다.
+    일별 집계를 갱신하기 전에 같은 트랜잭션에서 호출한다. (유저 행 잠금 -> 집계 순서를 reconcile_counters와 맞춤)
+    '''
+    month = current_month()
+    totals = defaultdict(lambda: [0, 0])
+    for (user_id, _, day), (total, _, excluded_total) in deltas.items():
+        totals[user_id][0] += total - excluded_total
+        if day.replace(day=1) == month:
+            totals[user_id][1] += total - excluded_total
+
+    for user_id, (total, month_total) in totals.items():
+        if not total and not month_total:
+            continue
+        # 카운터의 월이 지났으면 갱신 전 이번 달 집계에서 다시 시작한다
+        # (MySQL은 SET을 순서대로 평가하므로 month_total_month는 마지막에 바꾼다)
+        User.objects.filter(pk=user_id).update(
+            total=F('total') + total,
+            month_total=Case(
+                When(month_total_month=month, then=F('month_total') + month_total),
+                default=Coalesce(Subquery(month_spent(month).filter(user_id=OuterRef('pk')).values('spent')), 0) + month_total,
+            ),
+            month_total_month=month,
+        )
+
+
+def reconcile_counters(user=None, batch_size=1000, user_ids=None):
+    '''
+    일별 집계로부터 유저별 총액 / 이번 달 총액을 다시 계산해 다른 값만 고친다. (불일치 복구용)
+    유저 묶음마다 행을 잠그고 계산하므로 지출 쓰기와 동시에 실행해도 된다. 고친 유저 수를 반환한다.
+    '''
+    month = current_month()
+    users = User.objects.order_by('pk')
+    if user is not None:
+        users = users.filter(pk=user.pk)
+    elif user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+
+    fixed = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                users.filter(pk__gt=last_id)
+                     .select_for_update()
+                     .values_list('pk', 'total', 'month_total', 'month_total_month')[:batch_size]
+            )
+            if not rows:
+                return fixed
+
+            user_ids = [row[0] for row in rows]
+            totals = dict(
+                spend_totals(DailySpendRollup.objects.filter(user_id__in=user_ids), 'user_id', excluded=None)
+                .values_list('user_id', 'spent')
+            )
+            month_totals = dict(month_spent(month, user_ids).values_list('user_id', 'spent'))
+
+            stale = []
+            for user_id, total, month_total, month_total_month in rows:
+                expected = (totals.get(user_id) or 0, month_totals.get(user_id) or 0, month)
+                if (total, month_total, month_total_month) != expected:
+                    stale.append(User(pk=user_id, total=expected[0], month_total=expected[1], month_total_month=month))
+            User.objects.bulk_update(stale, ['total', 'month_total', 'month_total_month'], batch_size=batch_size)
+            fixed += len(stale)
+        last_id = user_ids[-1]
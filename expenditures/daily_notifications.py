@@ -0,0 +1,170 @@
+import json
+import sys
+import urllib.request
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.utils.module_loading import import_string
+
+from budgets.models import Budget
+from budgets.registry import categories
+from expenditures.aggregates import spend_totals
+from expenditures.budget_status import get_statuses
+from expenditures.models import DailySpendRollup
+from expenditures.notifications import build_noti
+from expenditures.recommendations import build_recommendation
+
+
+class StdoutSink:
+    # 한 줄에 알림 하나 (JSON)
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write(self, messages):
+        for message in messages:
+            self.stream.write(json.dumps(message, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self.stream.flush()
+
+
+class FileSink(StdoutSink):
+    def __init__(self, path):
+        super().__init__(open(path, 'w', encoding='utf-8'))
+
+    def close(self):
+        self.stream.close()
+
+
+class WebhookSink:
+    '''
+    청크 단위로 알림 목록을 JSON으로 POST 한다. (발송 서버 연동 전 임시 구현)
+    '''
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def write(self, messages):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({'notifications': messages}, ensure_ascii=False).encode(),
+            method='POST',
+            headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def close(self):
+        pass
+
+
+SINKS = {
+    'stdout': StdoutSink,
+    'file': FileSink,
+    'webhook': WebhookSink,
+}
+
+
+def get_sink(spec):
+    '''
+    'stdout', 'file:/path/out.jsonl', 'webhook:https://...' 또는 'path.to.SinkClass[:인자]'
+    '''
+    name, _, argument = spec.partition(':')
+    sink_class = SINKS[name] if name in SINKS else import_string(name)
+    return sink_class(argument) if argument else sink_class()
+
+
+def iter_user_chunks(chunk_size):
+    # 예산이 있는 유저만 (user, category) 유니크 인덱스를 따라 id 순으로 나눈다
+    last_id = 0
+    while True:
+        user_ids = list(
+            Budget.objects.filter(user_id__gt=last_id)
+                          .order_by('user_id')
+                          .values_list('user_id', flat=True)
+                          .distinct()[:chunk_size]
+        )
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+def load_chunk(user_ids, today):
+    '''
+    유저 묶음의 알림 계산에 필요한 값을 유저 수와 관계없이 고정된 수의 그룹 쿼리로 읽는다.
+    (예산, 오늘 이전 지출 합계, 오늘 지출 합계, 이번 달 스냅샷)
+    '''
+    budgets = defaultdict(dict)
+    for user_id, category_id, amount in Budget.objects.filter(user_id__in=user_ids).values_list('user_id', 'category_id', 'amount'):
+        budgets[user_id][category_id] = amount
+
+    spent = defaultdict(dict)
+    spent_rows = spend_totals(
+        DailySpendRollup.objects.filter(user_id__in=user_ids, day__lt=today),
+        'user_id',
+        'category_id',
+        excluded=None,
+    ).values_list('user_id', 'category_id', 'spent')
+    for user_id, category_id, total in spent_rows:
+        spent[user_id][category_id] = total
+
+    today_totals = dict(
+        spend_totals(
+            DailySpendRollup.objects.filter(user_id__in=user_ids, day=today),
+            'user_id',
+            excluded=None,
+        ).values_list('user_id', 'spent')
+    )
+    statuses = get_statuses(user_ids, today.replace(day=1))
+
+    return [
+        (user_id, budgets[user_id], spent[user_id], today_totals.get(user_id), statuses[user_id])
+        for user_id in user_ids
+    ]
+
+
+def assemble(category_names, rows, today):
+    # 프로세스 풀에서 실행 (DB 조회 없이 메시지만 조립)
+    return [
+        {
+            'user_id': user_id,
+            'date': today.isoformat(),
+            'recommendation': build_recommendation(category_names, budgets, spent, today),
+            'noti': build_noti(category_names, today_total, statuses, today),
+        }
+        for user_id, budgets, spent, today_total, statuses in rows
+    ]
+
+
+def send_daily_notifications(sink, today, chunk_size=1000, workers=0):
+    '''
+    예산이 있는 모든 유저의 오늘 지출 추천과 오늘 지출 안내를 청크 단위로 계산해 sink로 보낸다.
+    DB 조회는 현재 프로세스에서, 메시지 조립은 workers 개의 프로세스에서 실행해 둘이 겹치게 한다.
+    보낸 유저 수를 반환한다.
+    '''
+    category_names = categories.names()
+    sent = 0
+
+    if not workers:
+        for user_ids in iter_user_chunks(chunk_size):
+            messages = assemble(category_names, load_chunk(user_ids, today), today)
+            sink.write(messages)
+            sent += len(messages)
+        return sent
+
+    # fork로 띄워 Django 설정을 그대로 물려받는다. 조립 중인 청크는 workers * 2 개까지만 메모리에 둔다
+    with ProcessPoolExecutor(workers, mp_context=get_context('fork')) as executor:
+        pending = deque()
+        for user_ids in iter_user_chunks(chunk_size):
+            pending.append(executor.submit(assemble, category_names, load_chunk(user_ids, today), today))
+            if len(pending) >= workers * 2:
+                messages = pending.popleft().result()
+                sink.write(messages)
+                sent += len(messages)
+        while pending:
+            messages = pending.popleft().result()
+            sink.write(messages)
+            sent += len(messages)
+    return sent
@@ -0,0 +1,105 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ParseError
+
+from expenditures.aggregates import spend_totals
+from expenditures.models import Expenditure
+
+
+def filter_expenditures(user_id, query_params):
+    '''
+    유저의 지출을 조회 조건으로 필터링한다.
+    - start_date, end_date: 기간
+    - category_id: 카테고리
+    - min_amount, max_amount: 최소, 최대 금액
+    '''
+    # 기간 필터링
+    start_date_str = query_params.get('start_date', None)
+    end_date_str = query_params.get('end_date', None)
+
+    start_date = parse_datetime(start_date_str) if start_date_str else None
+    end_date = parse_datetime(end_date_str) if end_date_str else None
+
+    # 카테고리 필터링
+    category_id = query_params.get('category_id', None)
+    category_filter = {'category_id': category_id} if category_id else {}
+
+    # 최소, 최대 금액 필터링
+    min_amount = query_params.get('min_amount', None)
+    max_amount = query_params.get('max_amount', None)
+    amount_filter = {}
+    if min_amount:
+        amount_filter['expense_amount__gte'] = min_amount
+    if max_amount:
+        amount_filter['expense_amount__lte'] = max_amount
+
+    # 기간이 주어진 경우에만 (user, expense_date) 인덱스 범위 조건 적용
+    date_filter = {}
+    if start_date:
+        date_filter['expense_date__gte'] = start_date
+    if end_date:
+        date_filter['expense_date__lte'] = end_date
+
+    # 지출 목록 조회
+    return Expenditure.objects.filter(
+        user_id=user_id,
+        **date_filter,
+        **category_filter,
+        **amount_filter
+    )
+
+
+def select_expenditures(user_id, data):
+    '''
+    일괄 수정/삭제 대상 지출을 고른다.
+    - ids: 지출 id 목록
+    - filter: filter_expenditures와 같은 조회 조건 (start_date, end_date, category_id, min_amount, max_amount)
+    조건을 잘못 쓰면 대상이 넓어지지 않도록 무시하지 않고 ParseError를 낸다.
+    '''
+    if not isinstance(data, dict):
+        raise ParseError('ids 또는 filter를 담은 객체가 필요합니다.')
+    ids = data.get('ids', None)
+    spec = data.get('filter', None)
+    if (ids is None) == (spec is None):
+        raise ParseError('ids 또는 filter 중 하나가 필요합니다.')
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(isinstance(id, int) and not isinstance(id, bool) for id in ids):
+            raise ParseError('ids는 지출 id 목록이어야 합니다.')
+        return Expenditure.objects.filter(user_id=user_id, pk__in=ids)
+
+    if not isinstance(spec, dict) or not spec:
+        raise ParseError('filter는 비어 있지 않은 객체여야 합니다.')
+    unknown = set(spec) - {'start_date', 'end_date', 'category_id', 'min_amount', 'max_amount'}
+    if unknown:
+        raise ParseError(f'알 수 없는 filter 조건입니다: {", ".join(sorted(unknown))}')
+    for name in ('start_date', 'end_date'):
+        try:
+            if spec.get(name) and parse_datetime(str(spec[name])) is None:
+                raise ValueError
+        except ValueError:
+            raise ParseError(f'{name}는 ISO 8601 날짜/시간이어야 합니다.')
+    for name in ('category_id', 'min_amount', 'max_amount'):
+        if name in spec and (isinstance(spec[name], bool) or not str(spec[name]).isdigit()):
+            raise ParseError(f'{name}는 0 이상의 정수여야 합니다.')
+    return filter_expenditures(user_id, spec)
+
+
+def category_totals_queryset(expenditures):
+    # 카테고리별 합계(합계 제외 지출 제외)와 합계 제외 지출 합계를 한 번의 그룹 쿼리로 계산
+    return spend_totals(expenditures, 'category__name', included='category_total', excluded='excluded_total')
+
+
+def build_totals(category_totals):
+    # 총액은 카테고리별 합계를 메모리에서 합산
+    total_expense = sum(item['category_total'] or 0 for item in category_totals) if category_totals else None
+    total_excluded = sum(item['excluded_total'] or 0 for item in category_totals) if category_totals else None
+    return {
+        'total_expense': total_expense,
+        'total_excluded': total_excluded,
+        'category_totals': category_totals,
+    }
+
+
+async def adict(queryset):
+    # values_list(key, value) 쿼리셋을 async로 읽어 dict로 만든다
+    return {key: value async for key, value in queryset}
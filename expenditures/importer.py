@@ -0,0 +1,105 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from budgets.registry import categories
+from config.cache import bump_user_version
+from expenditures import rollups
+from expenditures.models import Expenditure, to_expense_day
+
+
+class ExpenditureImportSerializer(serializers.ModelSerializer):
+    '''
+    일괄 등록용 행 검증
+    category(id) 또는 category_name 중 하나가 필요하다.
+    지출일시, 금액, 메모는 모델 필드의 검증(DB 컬럼 범위 포함)을 그대로 따른다.
+    '''
+    is_except = serializers.BooleanField(required=False, default=False)
+    # 카테고리는 행마다 조회하지 않고 registry로 확인
+    category = serializers.IntegerField(required=False, allow_null=True)
+    category_name = serializers.CharField(required=False, allow_blank=True)
+
+    class Meta:
+        model = Expenditure
+        fields = ('expense_date', 'expense_amount', 'memo', 'is_except', 'category', 'category_name')
+        # SQLite는 컬럼 범위를 검증기로 주지 않으므로 음수는 직접 막는다
+        extra_kwargs = {'expense_amount': {'min_value': 0}}
+
+    def validate(self, attrs):
+        if not attrs.get('category') and not attrs.get('category_name'):
+            raise serializers.ValidationError("category 또는 category_name이 필요합니다.")
+        return attrs
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # [{'row': 행 번호(0부터), 'errors': {...}}]
+
+    def add_error(self, row, errors):
+        self.errors.append({'row': row, 'errors': errors})
+
+    @property
+    def data(self):
+        return {
+            'created': self.created,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_expenditures(user_id, rows, chunk_size=1000):
+    '''
+    rows(dict의 iterable)를 chunk_size 단위로 검증하고 bulk_create로 저장한다.
+    잘못된 행은 건너뛰고 행 번호와 함께 오류를 모아 반환한다.
+    청크마다 하나의 트랜잭션에서 지출 저장과 일별 집계 갱신을 함께 처리한다.
+    '''
+    result = ImportResult()
+    validator = ExpenditureImportSerializer()
+    category_ids = categories.ids()  # 카테고리 이름 -> id
+    known_category_ids = categories.names()  # id -> 이름 (존재하는 카테고리 id 확인용)
+
+    offset = 0
+    for chunk in _chunks(rows, chunk_size):
+        validated = []
+        for index, row in enumerate(chunk, start=offset):
+            try:
+                validated.append((index, validator.run_validation(row)))
+            except serializers.ValidationError as e:
+                result.add_error(index, e.detail)
+        offset += len(chunk)
+
+        expenditures = []
+        for index, attrs in validated:
+            category_id = attrs.get('category') or category_ids.get(attrs.get('category_name'))
+            if category_id is None or (attrs.get('category') and category_id not in known_category_ids):
+                result.add_error(index, {'category': ["존재하지 않는 카테고리입니다."]})
+                continue
+
+            expenditures.append(Expenditure(
+                user_id=user_id,
+                category_id=category_id,
+                expense_date=attrs['expense_date'],
+                expense_day=to_expense_day(attrs['expense_date']),
+                expense_amount=attrs['expense_amount'],
+                memo=attrs.get('memo'),
+                is_except=attrs['is_except'],
+            ))
+
+        if expenditures:
+            with transaction.atomic():
+                Expenditure.objects.bulk_create(expenditures)
+                rollups.add_expenditures(expenditures)
+                bump_user_version(user_id)
+            result.created += len(expenditures)
+
+    return result
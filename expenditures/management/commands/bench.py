@@ -0,0 +1,304 @@
+import json
+import random
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auths.models import User
+from budgets.registry import categories
+from expenditures.models import Expenditure
+
+# 기본 요청 구성 (name, method, path, weight, body[, staff])
+# path의 {id}는 요청하는 유저의 지출 id, {user_ids}는 bench 유저 id 목록, body의 {category}는 카테고리 id, {n}은 요청 번호로 바뀐다
+# {delete_id}, {delete_ids}(2건)는 삭제할 지출 id로, 이후 요청의 {id}로는 쓰이지 않는다
+# staff=True 이면 관리자(bench-admin) 토큰으로 요청한다
+DEFAULT_MIX = [
+    ('expenditures.list', 'GET', '/api/expenditures/', 20, None),
+    ('expenditures.list.filtered', 'GET', '/api/expenditures/?min_amount=10000&totals=false&page_size=50', 5, None),
+    ('expenditures.create', 'POST', '/api/expenditures/', 5, {
+        'expense_date': '{now}', 'expense_amount': 12000, 'memo': 'bench', 'category': '{category}',
+    }),
+    ('expenditures.bulk', 'POST', '/api/expenditures/bulk/', 1, [
+        {'expense_date': '{now}', 'expense_amount': 3000, 'category': '{category}'},
+        {'expense_date': '{now}', 'expense_amount': 4000, 'category': '{category}'},
+    ]),
+    ('expenditures.detail', 'GET', '/api/expenditures/{id}/', 10, None),
+    ('expenditures.update', 'PUT', '/api/expenditures/{id}/', 3, {
+        'expense_date': '{now}', 'expense_amount': 15000, 'memo': 'bench', 'category': '{category}',
+    }),
+    ('expenditures.delete', 'DELETE', '/api/expenditures/{delete_id}/', 1, None),
+    ('expenditures.batch.update', 'PATCH', '/api/expenditures/batch/', 1, {
+        'filter': {'min_amount': 45000}, 'category': '{category}',
+    }),
+    ('expenditures.batch.delete', 'DELETE', '/api/expenditures/batch/', 1, {'ids': '{delete_ids}'}),
+    ('expenditures.rec', 'GET', '/api/expenditures/rec/', 15, None),
+    ('expenditures.noti', 'GET', '/api/expenditures/noti/', 10, None),
+    ('expenditures.statistics', 'GET', '/api/expenditures/statistics/', 10, None),
+    ('expenditures.series', 'GET', '/api/expenditures/series/', 3, None),
+    ('expenditures.series.weekly', 'GET', '/api/expenditures/series/?interval=week&split=category', 2, None),
+    ('expenditures.status', 'GET', '/api/expenditures/status/?user_ids={user_ids}', 1, None, True),
+    ('budgets.categories', 'GET', '/api/budgets//', 5, None),
+    ('budgets.rec', 'POST', '/api/budgets/rec/', 5, {'total_amount': 1000000}),
+    ('budgets.update', 'PUT', '/api/budgets/rec/', 2, {'budgets': {'식비': {'amount': 300000, 'ratio': 30}}}),
+    ('auths.login', 'POST', '/api/auths/jwt-login', 1, {'username': '{username}', 'password': '{password}'}),
+    ('auths.signup', 'POST', '/api/auths/signup', 1, {'username': 'bench-signup-{n}-{run}', 'password': 'Bench-password-1'}),
+    ('metrics', 'GET', '/metrics', 1, None),
+]
+
+
+def percentile(sorted_values, percent):
+    # nearest-rank 방식
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def fill(value, context):
+    if isinstance(value, str):
+        # '{category}'처럼 값 전체가 자리표시자이면 원래 타입(숫자, 목록)을 유지
+        if value.startswith('{') and value.endswith('}') and value[1:-1] in context:
+            return context[value[1:-1]]
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {key: fill(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, context) for item in value]
+    return value
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "데이터를 생성하고 모든 API에 요청 구성을 재생해 엔드포인트별 p50/p95/p99 응답 시간, "
+        "요청당 쿼리 수, 처리량을 측정합니다. (설정된 DB에 직접 쓰므로 운영 DB에서 실행하지 마세요)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--expenditures-per-user', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--base-date', help='seed_expenditures의 --base-date (실행 날짜와 관계없이 같은 데이터로 비교할 때 지정)')
+        parser.add_argument('--skip-seed', action='store_true', help='이미 생성된 bench 유저 데이터를 그대로 사용합니다.')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--mix', help='요청 구성 JSONL 파일 (한 줄에 {"name", "method", "path", "weight", "body", "staff"})')
+        parser.add_argument('--target', help='로컬 gunicorn 등 실행 중인 서버 주소 (없으면 Django test client로 프로세스 안에서 실행)')
+        parser.add_argument('--concurrency', type=int, default=8, help='--target 사용 시 동시 요청 수')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+        parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        prefix, password = 'bench-user', 'devpassword1'
+        # seed_expenditures는 bench 유저의 기존 지출을 지우고 다시 만들므로 이전 실행의 생성/삭제 요청이 남지 않는다
+        if not options['skip_seed']:
+            call_command(
+                'seed_expenditures',
+                users=options['users'],
+                expenditures_per_user=options['expenditures_per_user'],
+                seed=options['seed'],
+                base_date=options['base_date'],
+                prefix=prefix,
+                password=password,
+                stdout=self.stdout,
+            )
+
+        users = list(User.objects.filter(username__startswith=f'{prefix}-').order_by('id')[:options['users']])
+        if not users:
+            raise CommandError("bench 유저가 없습니다. --skip-seed 없이 실행하세요.")
+
+        staff, _ = User.objects.get_or_create(username='bench-admin', defaults={'is_staff': True})
+        # 요청 전 데이터 크기 (--compare 결과와 다르면 같은 데이터로 측정한 것이 아니다)
+        dataset = {'users': len(users), 'expenditures': Expenditure.objects.filter(user__in=users).count()}
+
+        rng = random.Random(options['seed'])
+        mix = self.load_mix(options['mix'])
+        plan = self.build_plan(rng, mix, users, staff, password, options['requests'])
+
+        started = time.perf_counter()
+        if options['target']:
+            samples = self.run_remote(options['target'].rstrip('/'), plan, options['concurrency'])
+        else:
+            samples = self.run_local(plan)
+        elapsed = time.perf_counter() - started
+
+        result = {
+            'revision': git_revision(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'options': {key: options[key] for key in ('users', 'expenditures_per_user', 'seed', 'base_date', 'requests', 'target', 'concurrency')},
+            'dataset': dataset,
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else None,
+            'endpoints': self.summarize(samples),
+        }
+        previous = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                previous = json.load(f)
+
+        self.report(result, previous)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+    def load_mix(self, path):
+        if not path:
+            return DEFAULT_MIX
+        with open(path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        try:
+            return [
+                (
+                    entry['name'],
+                    entry.get('method', 'GET').upper(),
+                    entry['path'],
+                    entry.get('weight', 1),
+                    entry.get('body'),
+                    entry.get('staff', False),
+                )
+                for entry in entries
+            ]
+        except KeyError as exc:
+            raise CommandError(f"요청 구성에 {exc} 항목이 없습니다.")
+
+    def build_plan(self, rng, mix, users, staff, password, count):
+        # 같은 --seed 이면 같은 순서로 요청하도록 미리 정해 둔다
+        tokens = {user.pk: str(AccessToken.for_user(user)) for user in users}
+        staff_token = str(AccessToken.for_user(staff))
+        user_ids = ','.join(str(user.pk) for user in users)
+        expenditure_ids = {
+            user.pk: list(Expenditure.objects.filter(user=user).order_by('-id').values_list('id', flat=True)[:100])
+            for user in users
+        }
+        category_ids = list(categories.names())
+
+        run = int(time.time())
+        weights = [entry[3] for entry in mix]
+        plan = []
+        for n in range(count):
+            name, method, path, _, body, *as_staff = rng.choices(mix, weights=weights)[0]
+            user = rng.choice(users)
+            ids = expenditure_ids[user.pk]
+            template = path + json.dumps(body)
+            deleted = 1 if '{delete_id}' in template else 2 if '{delete_ids}' in template else 0
+            if ('{id}' in path or deleted) and len(ids) <= deleted:
+                continue
+            delete_ids = [ids.pop() for _ in range(deleted)]
+            context = {
+                'delete_id': delete_ids[0] if delete_ids else '',
+                'delete_ids': delete_ids,
+                'id': rng.choice(ids) if ids else '',
+                'category': rng.choice(category_ids),
+                'now': datetime.now().replace(microsecond=0).isoformat(),
+                'username': user.username,
+                'password': password,
+                'user_ids': user_ids,
+                'n': n,
+                'run': run,
+            }
+            token = staff_token if as_staff and as_staff[0] else tokens[user.pk]
+            plan.append((name, method, path.format(**context), fill(body, context), token))
+        return plan
+
+    def run_local(self, plan):
+        client = Client(raise_request_exception=False)
+        samples = []
+        # test client의 Host(testserver)를 허용
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, method, path, body, token in plan:
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.generic(
+                        method,
+                        path,
+                        json.dumps(body) if body is not None else '',
+                        content_type='application/json',
+                        HTTP_AUTHORIZATION=f'Bearer {token}',
+                    )
+                    elapsed = time.perf_counter() - started
+                samples.append((name, elapsed, response.status_code, len(queries)))
+        return samples
+
+    def run_remote(self, target, plan, concurrency):
+        def send(entry):
+            name, method, path, body, token = entry
+            request = urllib.request.Request(
+                target + path,
+                data=json.dumps(body).encode() if body is not None else None,
+                method=method,
+                headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+            )
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            # 원격 서버의 쿼리 수는 /metrics 에서 확인한다
+            return name, time.perf_counter() - started, status, None
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            return list(executor.map(send, plan))
+
+    def summarize(self, samples):
+        grouped = defaultdict(list)
+        for sample in samples:
+            grouped[sample[0]].append(sample)
+
+        endpoints = {}
+        for name, group in sorted(grouped.items()):
+            latencies = sorted(elapsed * 1000 for _, elapsed, _, _ in group)
+            queries = [count for _, _, _, count in group if count is not None]
+            endpoints[name] = {
+                'requests': len(group),
+                'p50_ms': round(percentile(latencies, 50), 2),
+                'p95_ms': round(percentile(latencies, 95), 2),
+                'p99_ms': round(percentile(latencies, 99), 2),
+                'queries_per_request': round(sum(queries) / len(queries), 1) if queries else None,
+                'statuses': dict(Counter(str(status) for _, _, status, _ in group)),
+            }
+        return endpoints
+
+    def report(self, result, previous):
+        previous_endpoints = (previous or {}).get('endpoints', {})
+        if previous and previous.get('dataset') != result['dataset']:
+            self.stdout.write(self.style.WARNING(
+                f"이전 결과와 데이터 크기가 다릅니다: {previous.get('dataset')} -> {result['dataset']}"
+            ))
+        self.stdout.write(f"{'endpoint':<28} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}  status")
+        for name, stats in result['endpoints'].items():
+            line = (
+                f"{name:<28} {stats['requests']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+                f" {stats['queries_per_request'] if stats['queries_per_request'] is not None else '-':>8}  {stats['statuses']}"
+            )
+            before = previous_endpoints.get(name)
+            if before:
+                line += f"  p95 {stats['p95_ms'] - before['p95_ms']:+.2f}ms"
+            self.stdout.write(line)
+
+        summary = f"총 {sum(stats['requests'] for stats in result['endpoints'].values())}건, {result['throughput_rps']} req/s"
+        if previous and previous.get('throughput_rps'):
+            summary += f" (이전 {previous['throughput_rps']} req/s, {previous.get('revision')})"
+        self.stdout.write(self.style.SUCCESS(summary))
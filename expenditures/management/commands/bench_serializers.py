@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from auths.models import User
+from budgets.models import Category
+from expenditures.models import Expenditure
+from expenditures.serializers import ExpenditureRowSerializer, ExpenditureSerializer
+
+
+class Command(BaseCommand):
+    help = "ExpenditureSerializer와 ExpenditureRowSerializer의 초당 직렬화 행 수를 비교합니다. (데이터는 롤백됩니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(username='bench-serializer')
+            category = Category.objects.create(name='bench-serializer')
+
+            created = 0
+            for rows in sorted(options['rows']):
+                self.create_rows(user, category, created, rows - created)
+                created = max(created, rows)
+                queryset = Expenditure.objects.filter(user=user).order_by('-expense_date', '-id')[:rows]
+
+                model_rate = self.measure(options['repeat'], rows, lambda: ExpenditureSerializer(queryset, many=True).data)
+                fast_rate = self.measure(options['repeat'], rows, lambda: ExpenditureRowSerializer(ExpenditureRowSerializer.values(queryset)).data)
+
+                self.stdout.write(
+                    f"{rows:>8} rows | ModelSerializer {model_rate:>12,.0f} rows/s"
+                    f" | RowSerializer {fast_rate:>12,.0f} rows/s | x{fast_rate / model_rate:.1f}"
+                )
+
+            transaction.set_rollback(True)
+
+    def create_rows(self, user, category, offset, count):
+        start = datetime(2023, 1, 1)
+        Expenditure.objects.bulk_create(
+            (
+                Expenditure(
+                    user=user,
+                    category=category,
+                    expense_date=start + timedelta(minutes=offset + index),
+                    expense_day=(start + timedelta(minutes=offset + index)).date(),
+                    expense_amount=(offset + index) % 50000,
+                    memo='벤치마크',
+                )
+                for index in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def measure(self, repeat, rows, serialize):
+        # 조회 + 직렬화 + JSON 렌더링까지 포함한 가장 빠른 회차 기준
+        renderer = JSONRenderer()
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            renderer.render(serialize())
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return rows / best
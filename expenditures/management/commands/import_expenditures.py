@@ -0,0 +1,42 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from auths.models import User
+from expenditures.importer import import_expenditures
+
+
+class Command(BaseCommand):
+    help = "CSV 또는 JSON 파일의 지출 내역을 유저에게 일괄 등록합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv 또는 .json 파일 경로')
+        parser.add_argument('--user', required=True, help='지출을 등록할 유저(username)')
+        parser.add_argument('--chunk-size', type=int, default=settings.EXPENDITURE_IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"유저를 찾을 수 없습니다: {options['user']}")
+
+        path = options['path']
+        with open(path, encoding='utf-8', newline='') as f:
+            if path.endswith('.json'):
+                rows = json.load(f)
+            elif path.endswith('.csv'):
+                # 파일 전체를 메모리에 올리지 않고 한 줄씩 읽는다
+                rows = (
+                    {key: value for key, value in row.items() if key is not None and value != ''}
+                    for row in csv.DictReader(f)
+                )
+            else:
+                raise CommandError("지원하지 않는 파일 형식입니다. (.csv, .json)")
+
+            result = import_expenditures(user.pk, rows, chunk_size=options['chunk_size'])
+
+        for error in result.data['errors']:
+            self.stderr.write(f"{error['row']}행: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"지출 {result.created}건을 등록했습니다. (오류 {len(result.errors)}건)"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auths.models import User
+from expenditures.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "지출 내역으로부터 일별/카테고리별 지출 집계(DailySpendRollup)를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='특정 유저(username)의 집계만 다시 만듭니다.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"유저를 찾을 수 없습니다: {options['user']}")
+
+        created = rebuild_rollups(user=user, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"집계 행 {created}건을 생성했습니다."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auths.models import User
+from expenditures.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "일별 지출 집계로부터 유저별 총액 카운터(User.total, month_total)를 다시 계산해 불일치를 고칩니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='특정 유저(username)의 카운터만 확인합니다.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"유저를 찾을 수 없습니다: {options['user']}")
+
+        fixed = reconcile_counters(user=user, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"카운터 {fixed}건을 고쳤습니다."))
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from expenditures.statistics import refresh_distribution
+
+
+class Command(BaseCommand):
+    help = "월별 유저 지출 합계 분포(Statistics의 다른 유저 대비 비교용)를 다시 계산합니다. (cron 등으로 주기 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='YYYY-MM (기본값: 지난 달)')
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                month_start = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError("--month는 YYYY-MM 형식이어야 합니다.")
+        else:
+            month_start = (datetime.now().date().replace(day=1) - timedelta(days=1)).replace(day=1)
+
+        distribution = refresh_distribution(month_start)
+        self.stdout.write(self.style.SUCCESS(
+            f"{month_start:%Y-%m}: 유저 {distribution.user_count}명, 평균 {distribution.average:,.0f}"
+        ))
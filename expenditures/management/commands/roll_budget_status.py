@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from expenditures.budget_status import current_month, initialize_month, rebuild_month
+
+
+class Command(BaseCommand):
+    help = "월별 예산 스냅샷(MonthlyBudgetStatus)을 만듭니다. 매월 1일 cron 등으로 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='YYYY-MM (기본값: 이번 달)')
+        parser.add_argument('--rebuild', action='store_true', help='해당 월의 스냅샷을 지우고 다시 만듭니다.')
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError("--month는 YYYY-MM 형식이어야 합니다.")
+        else:
+            month = current_month()
+
+        if options['rebuild']:
+            count = rebuild_month(month)
+        else:
+            count = initialize_month(month)
+        self.stdout.write(self.style.SUCCESS(f"{month:%Y-%m}: 스냅샷 {count}건 확인"))
@@ -0,0 +1,153 @@
+import random
+import time
+from datetime import date, datetime, time as day_time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from faker import Faker
+
+from auths.models import User
+from budgets.models import Category, Budget
+from config.cache import bump_category_version, bump_user_version
+from expenditures.models import Expenditure
+from expenditures.rollups import rebuild_rollups
+
+DEFAULT_CATEGORIES = ['식비', '교통', '주거', '통신', '쇼핑', '여가', '의료', '교육', '경조사', '기타']
+
+
+class Command(BaseCommand):
+    help = "부하 테스트용 유저, 카테고리, 예산, 지출 데이터를 생성합니다. (생성할 유저의 기존 지출은 지우므로 같은 --seed, --base-date 이면 같은 데이터)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--expenditures-per-user', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=365, help='기준일부터 며칠 전까지 지출을 분포시킬지')
+        parser.add_argument('--base-date', help='지출 기간의 마지막 날 YYYY-MM-DD (기본값: 오늘)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='seed-user', help='생성할 유저 username 접두어')
+        parser.add_argument('--password', default='devpassword1')
+        parser.add_argument('--skip-rollups', action='store_true', help='일별 집계 재생성을 건너뜁니다.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        fake = Faker('ko_KR')
+        fake.seed_instance(options['seed'])
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        try:
+            base_date = date.fromisoformat(options['base_date']) if options['base_date'] else datetime.now().date()
+        except ValueError:
+            raise CommandError("--base-date는 YYYY-MM-DD 형식이어야 합니다.")
+
+        categories = self.seed_categories()
+        users = self.seed_users(options['users'], options['prefix'], options['password'], batch_size)
+        users_per_batch = max(1, batch_size // max(1, options['expenditures_per_user']))
+        self.seed_budgets(rng, users, categories, batch_size)
+        self.clear_expenditures(users, users_per_batch)
+
+        # 행마다 Faker를 호출하면 느리므로 메모를 미리 만들어 두고 골라 쓴다
+        memos = [fake.catch_phrase() for _ in range(1000)] + [None] * 250
+        created = self.seed_expenditures(
+            rng,
+            memos,
+            users,
+            categories,
+            options['expenditures_per_user'],
+            options['days'],
+            base_date,
+            batch_size,
+        )
+
+        if not options['skip_rollups']:
+            self.rebuild(users, users_per_batch, batch_size)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"유저 {len(users)}명, 카테고리 {len(categories)}개, 지출 {created}건 생성 "
+            f"(기준일 {base_date.isoformat()}, {elapsed:.1f}s)"
+        ))
+
+    def rebuild(self, users, users_per_batch, batch_size):
+        # 생성한 유저의 집계만 유저 묶음마다 별도 트랜잭션으로 다시 만들고 응답 캐시를 무효화한다
+        for index in range(0, len(users), users_per_batch):
+            user_ids = users[index:index + users_per_batch]
+            rebuild_rollups(user_ids=user_ids, batch_size=batch_size)
+            for user_id in user_ids:
+                bump_user_version(user_id)
+
+    def seed_categories(self):
+        Category.objects.bulk_create(
+            [Category(name=name) for name in DEFAULT_CATEGORIES],
+            ignore_conflicts=True,
+        )
+        bump_category_version()
+        return list(Category.objects.filter(name__in=DEFAULT_CATEGORIES).order_by('id').values_list('id', flat=True))
+
+    def seed_users(self, count, prefix, password, batch_size):
+        # 해싱은 한 번만 하고 모든 유저가 같은 해시를 사용
+        hashed_password = make_password(password)
+        usernames = [f'{prefix}-{index}' for index in range(count)]
+        User.objects.bulk_create(
+            [User(username=username, password=hashed_password) for username in usernames],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        return list(User.objects.filter(username__in=usernames).order_by('id').values_list('id', flat=True))
+
+    def seed_budgets(self, rng, users, categories, batch_size):
+        Budget.objects.filter(user_id__in=users).delete()
+
+        budgets = []
+        for user_id in users:
+            total_amount = rng.randrange(500000, 5000000, 10000)
+            weights = [rng.random() for _ in categories]
+            weight_sum = sum(weights)
+            for category_id, weight in zip(categories, weights):
+                ratio = weight / weight_sum * 100
+                budgets.append(Budget(
+                    user_id=user_id,
+                    category_id=category_id,
+                    amount=round(total_amount * ratio / 100, -2),
+                    ratio=round(ratio, 2),
+                ))
+        Budget.objects.bulk_create(budgets, batch_size=batch_size)
+
+    def clear_expenditures(self, users, users_per_batch):
+        # 다시 실행해도 같은 데이터가 되도록 생성할 유저의 기존 지출을 유저 묶음마다 지운다
+        for index in range(0, len(users), users_per_batch):
+            Expenditure.objects.filter(user_id__in=users[index:index + users_per_batch]).delete()
+
+    def seed_expenditures(self, rng, memos, users, categories, per_user, days, base_date, batch_size):
+        # 기준일 자정까지를 끝으로 잡아 실행한 날짜와 관계없이 같은 데이터를 만든다
+        end = datetime.combine(base_date + timedelta(days=1), day_time.min)
+        start = end - timedelta(days=days)
+        span_seconds = int((end - start).total_seconds())
+
+        created = 0
+        batch = []
+        for user_id in users:
+            for _ in range(per_user):
+                expense_date = start + timedelta(seconds=rng.randrange(span_seconds))
+                batch.append(Expenditure(
+                    user_id=user_id,
+                    category_id=rng.choice(categories),
+                    expense_date=expense_date,
+                    expense_day=expense_date.date(),
+                    expense_amount=rng.randrange(1000, 50000, 100),
+                    memo=rng.choice(memos),
+                    is_except=rng.random() < 0.05,
+                ))
+                if len(batch) >= batch_size:
+                    created += self.flush(batch)
+                    self.stdout.write(f"... 지출 {created}건 저장")
+                    batch = []
+        if batch:
+            created += self.flush(batch)
+        return created
+
+    def flush(self, batch):
+        with transaction.atomic():
+            Expenditure.objects.bulk_create(batch)
+        return len(batch)
@@ -0,0 +1,41 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from expenditures.daily_notifications import get_sink, send_daily_notifications
+
+
+class Command(BaseCommand):
+    help = "예산이 있는 모든 유저의 오늘 지출 추천과 오늘 지출 안내를 계산해 발송 대상(sink)으로 보냅니다. (매일 아침 cron 등으로 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sink', default='stdout', help="stdout | file:<경로> | webhook:<URL> | <Sink 클래스 경로>[:인자]")
+        parser.add_argument('--date', help='YYYY-MM-DD (기본값: 오늘)')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='한 번에 조회할 유저 수')
+        parser.add_argument('--workers', type=int, default=0, help='메시지 조립 프로세스 수 (0이면 현재 프로세스에서 조립)')
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--date는 YYYY-MM-DD 형식이어야 합니다.")
+        else:
+            today = datetime.now().date()
+
+        try:
+            sink = get_sink(options['sink'])
+        except ImportError:
+            raise CommandError(f"sink를 찾을 수 없습니다: {options['sink']}")
+
+        started = time.perf_counter()
+        try:
+            sent = send_daily_notifications(sink, today, chunk_size=options['chunk_size'], workers=options['workers'])
+        finally:
+            sink.close()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f"{today}: 유저 {sent}명 ({elapsed:.1f}s, {sent / elapsed if elapsed else 0:,.0f}명/s)"
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 10:00
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budgets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenditures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expenditure',
+            name='expense_date',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='expenditure',
+            name='expense_day',
+            field=models.DateField(default=datetime.date.today, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['user', 'expense_date'], name='expenditure_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['user', 'expense_day'], name='expenditure_user_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['user', 'category', 'expense_date'], name='expenditure_user_cat_date_idx'),
+        ),
+    ]
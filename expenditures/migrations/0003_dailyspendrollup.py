@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    Expenditure = apps.get_model('expenditures', 'Expenditure')
+    DailySpendRollup = apps.get_model('expenditures', 'DailySpendRollup')
+
+    rows = (
+        Expenditure.objects.values('user_id', 'category_id', 'expense_day')
+                           .annotate(
+                               total=Sum('expense_amount'),
+                               count=Count('id'),
+                               excluded_total=Sum('expense_amount', filter=Q(is_except=True)),
+                           )
+                           .order_by()
+    )
+    DailySpendRollup.objects.bulk_create(
+        (
+            DailySpendRollup(
+                user_id=row['user_id'],
+                category_id=row['category_id'],
+                day=row['expense_day'],
+                total=row['total'],
+                count=row['count'],
+                excluded_total=row['excluded_total'] or 0,
+            )
+            for row in rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budgets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenditures', '0002_expense_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySpendRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total', models.PositiveBigIntegerField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('excluded_total', models.PositiveBigIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='budgets.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailyspendrollup',
+            index=models.Index(fields=['user', 'day'], name='rollup_user_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyspendrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'category', 'day'), name='unique_rollup_user_category_day'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
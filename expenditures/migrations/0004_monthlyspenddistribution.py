@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenditures', '0003_dailyspendrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlySpendDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+                ('user_count', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(default=0)),
+                ('percentiles', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:00
+
+from datetime import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def backfill_current_month(apps, schema_editor):
+    Budget = apps.get_model('budgets', 'Budget')
+    DailySpendRollup = apps.get_model('expenditures', 'DailySpendRollup')
+    MonthlyBudgetStatus = apps.get_model('expenditures', 'MonthlyBudgetStatus')
+
+    month = datetime.now().date().replace(day=1)
+    statuses = {}
+    for user_id, category_id, amount in Budget.objects.values_list('user_id', 'category_id', 'amount'):
+        statuses[(user_id, category_id)] = [amount, 0]
+    spent = (
+        DailySpendRollup.objects.filter(day__gte=month)
+                                .values('user_id', 'category_id')
+                                .annotate(spent=Sum('total'))
+                                .order_by()
+    )
+    for row in spent:
+        statuses.setdefault((row['user_id'], row['category_id']), [0, 0])[1] = row['spent']
+
+    MonthlyBudgetStatus.objects.bulk_create(
+        (
+            MonthlyBudgetStatus(user_id=user_id, category_id=category_id, month=month, budget=budget, spent_to_date=spent)
+            for (user_id, category_id), (budget, spent) in statuses.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budgets', '0002_unique_budget_user_category'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenditures', '0004_monthlyspenddistribution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyBudgetStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('budget', models.PositiveBigIntegerField(default=0)),
+                ('spent_to_date', models.PositiveBigIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='budgets.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='monthlybudgetstatus',
+            index=models.Index(fields=['user', 'month'], name='budget_status_user_month_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlybudgetstatus',
+            constraint=models.UniqueConstraint(fields=('user', 'category', 'month'), name='unique_budget_status_user_category_month'),
+        ),
+        migrations.RunPython(backfill_current_month, migrations.RunPython.noop),
+    ]
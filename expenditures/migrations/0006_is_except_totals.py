@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 16:00
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+
+def recompute_current_month_spent(apps, schema_editor):
+    # 이번 달 스냅샷의 지출 합계에서 합계 제외(is_except) 지출을 뺀다
+    DailySpendRollup = apps.get_model('expenditures', 'DailySpendRollup')
+    MonthlyBudgetStatus = apps.get_model('expenditures', 'MonthlyBudgetStatus')
+
+    month = datetime.now().date().replace(day=1)
+    excluded = (
+        DailySpendRollup.objects.filter(day__gte=month, excluded_total__gt=0)
+                                .values('user_id', 'category_id')
+                                .annotate(excluded=Sum('excluded_total'))
+                                .order_by()
+    )
+    for row in excluded:
+        MonthlyBudgetStatus.objects.filter(
+            user_id=row['user_id'],
+            category_id=row['category_id'],
+            month=month,
+            spent_to_date__gte=row['excluded'],
+        ).update(spent_to_date=F('spent_to_date') - row['excluded'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenditures', '0005_monthlybudgetstatus'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(condition=models.Q(('is_except', False)), fields=['user', 'expense_date'], name='expenditure_user_date_incl_idx'),
+        ),
+        migrations.RunPython(recompute_current_month_spent, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,21 @@
+from datetime import datetime
+
 from django.db import models
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+
+def to_expense_day(expense_date):
+    # DateTimeField에 date가 들어오는 경우(더미 데이터 등)도 함께 처리
+    if isinstance(expense_date, datetime):
+        return expense_date.date()
+    return expense_date
+
+
 class Expenditure(models.Model):
+    expense_date = models.DateTimeField()  # 지출일시
+    expense_day = models.DateField(editable=False)  # 지출일 (expense_date의 날짜, 인덱스 조회용)
     appropriate_amount = models.PositiveIntegerField(default=0)  # 적정금액
     expense_amount = models.PositiveIntegerField(default=0)  # 지출금액
     memo = models.TextField(null=True, blank=True)  # 메모
@@ -12,4 +24,68 @@ class Expenditure(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    category = models.ForeignKey('budgets.Category', on_delete=models.CASCADE)
\ No newline at end of file
+    category = models.ForeignKey('budgets.Category', on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'expense_date'], name='expenditure_user_date_idx'),
+            models.Index(fields=['user', 'expense_day'], name='expenditure_user_day_idx'),
+            models.Index(fields=['user', 'category', 'expense_date'], name='expenditure_user_cat_date_idx'),
+            # 합계 포함 지출만 읽는 조회용 부분 인덱스 (부분 인덱스를 지원하지 않는 MySQL에서는 만들어지지 않는다)
+            models.Index(
+                fields=['user', 'expense_date'],
+                condition=models.Q(is_except=False),
+                name='expenditure_user_date_incl_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # __date 조회 시 컬럼을 함수로 감싸지 않도록 날짜를 별도 컬럼에 저장
+        self.expense_day = to_expense_day(self.expense_date)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'expense_date' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'expense_day'}
+        super().save(*args, **kwargs)
+
+
+class DailySpendRollup(models.Model):
+    day = models.DateField()  # 지출일
+    total = models.PositiveBigIntegerField(default=0)  # 지출 합계 (합계 제외 포함)
+    count = models.PositiveIntegerField(default=0)  # 지출 건수
+    excluded_total = models.PositiveBigIntegerField(default=0)  # 합계 제외 지출 합계
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey('budgets.Category', on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category', 'day'], name='unique_rollup_user_category_day'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'day'], name='rollup_user_day_idx'),
+        ]
+
+
+class MonthlySpendDistribution(models.Model):
+    month = models.DateField(unique=True)  # 해당 월 1일
+    user_count = models.PositiveIntegerField(default=0)  # 지출이 있는 유저 수
+    average = models.FloatField(default=0)  # 유저별 월 지출 합계의 평균
+    percentiles = models.JSONField(default=list)  # 0~100 백분위 경계값 (101개)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class MonthlyBudgetStatus(models.Model):
+    month = models.DateField()  # 해당 월 1일
+    budget = models.PositiveBigIntegerField(default=0)  # 카테고리 예산
+    spent_to_date = models.PositiveBigIntegerField(default=0)  # 이번 달 지출 합계 (합계 제외 지출 제외)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey('budgets.Category', on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category', 'month'], name='unique_budget_status_user_category_month'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'month'], name='budget_status_user_month_idx'),
+        ]
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+
+from budgets.registry import categories
+from expenditures.aggregates import aspend_totals, spend_totals
+from expenditures.budget_status import appropriate_and_danger, get_statuses
+from expenditures.models import DailySpendRollup
+
+
+def today_queryset(user_id, today):
+    # 오늘 지출한 내역
+    return DailySpendRollup.objects.filter(user_id=user_id, day=today)
+
+
+def build_noti(category_names, today_total_amount, statuses, today):
+    # statuses: 이번 달 스냅샷 {category_id: (예산, 이번 달 지출 합계)}
+    category_stats = []
+    for category_id, category_name in category_names.items():
+        category_budget, category_total_amount = statuses.get(category_id, (0, 0))
+        today_appropriate_amount, danger_percentage = appropriate_and_danger(category_budget, category_total_amount, today)
+
+        category_stats.append({
+            'category_name': category_name,
+            'today_appropriate_amount': today_appropriate_amount,
+            'today_expense_amount': category_total_amount,
+            'danger_percentage': danger_percentage
+        })
+
+    return {
+        'today_total_amount': today_total_amount,
+        'category_stats': category_stats
+    }
+
+
+def notify_today(user_id, today=None):
+    '''
+    오늘 지출 합계와 카테고리 별 적정 금액 대비 위험도를 계산한다.
+    카테고리 별 값은 이번 달 예산 스냅샷(MonthlyBudgetStatus)에서 한 번에 읽는다.
+    '''
+    today = today or datetime.now().date()
+    return build_noti(
+        categories.names(),
+        spend_totals(today_queryset(user_id, today), excluded=None)['spent'],
+        get_statuses([user_id], today.replace(day=1))[user_id],
+        today,
+    )
+
+
+async def anotify_today(user_id, today=None):
+    '''
+    notify_today의 async 버전.
+    오늘 합계와 스냅샷 쿼리를 함께 기다리지만 thread_sensitive 스레드 하나에서 차례로 실행된다.
+    '''
+    today = today or datetime.now().date()
+    category_names, today_total, statuses = await asyncio.gather(
+        sync_to_async(categories.names)(),
+        aspend_totals(today_queryset(user_id, today), excluded=None),
+        sync_to_async(get_statuses)([user_id], today.replace(day=1)),
+    )
+    return build_noti(category_names, today_total['spent'], statuses[user_id], today)
@@ -0,0 +1,73 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ParseError
+
+# 최신 지출부터 (expense_date, id) 키셋 순서로 정렬
+KEYSET_ORDERING = ('-expense_date', '-id')
+
+
+def encode_cursor(expense_date, id):
+    payload = json.dumps([expense_date.isoformat(), id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        expense_date, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        expense_date = parse_datetime(expense_date)
+    except (ValueError, TypeError):
+        raise ParseError(detail="잘못된 cursor 입니다.")
+
+    if expense_date is None or not isinstance(id, int):
+        raise ParseError(detail="잘못된 cursor 입니다.")
+    return expense_date, id
+
+
+def get_page_size(query_params):
+    page_size = query_params.get('page_size', None)
+    if not page_size:
+        return settings.EXPENDITURE_PAGE_SIZE
+
+    try:
+        page_size = int(page_size)
+    except ValueError:
+        raise ParseError(detail="page_size는 정수여야 합니다.")
+
+    if page_size < 1:
+        raise ParseError(detail="page_size는 1 이상이어야 합니다.")
+    return min(page_size, settings.EXPENDITURE_MAX_PAGE_SIZE)
+
+
+def page_queryset(queryset, cursor, page_size):
+    # cursor 이후의 지출을 다음 페이지 존재 여부 확인용 1건을 더해 조회하는 쿼리셋
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if cursor:
+        expense_date, id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(expense_date__lt=expense_date) | Q(expense_date=expense_date, id__lt=id)
+        )
+    return queryset[:page_size + 1]
+
+
+def build_page(rows, page_size, key):
+    next_cursor = encode_cursor(*key(rows[page_size - 1])) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
+
+def paginate(queryset, cursor, page_size, key=lambda expenditure: (expenditure.expense_date, expenditure.id)):
+    '''
+    cursor 이후의 지출을 page_size 만큼 반환한다.
+    OFFSET 없이 (user, expense_date) 인덱스 범위 조회만으로 다음 페이지를 찾는다.
+    key: 한 행에서 (expense_date, id)를 꺼내는 함수 (values_list 결과에도 사용)
+    '''
+    return build_page(list(page_queryset(queryset, cursor, page_size)), page_size, key)
+
+
+async def apaginate(queryset, cursor, page_size, key=lambda expenditure: (expenditure.expense_date, expenditure.id)):
+    # paginate의 async 버전
+    rows = [row async for row in page_queryset(queryset, cursor, page_size)]
+    return build_page(rows, page_size, key)
@@ -0,0 +1,26 @@
+import codecs
+import csv
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    '''
+    text/csv 요청 본문을 헤더 기준 dict 목록으로 변환한다.
+    빈 칸은 값이 없는 것으로 보고 제외한다.
+    '''
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            reader = csv.DictReader(codecs.getreader(encoding)(stream))
+            return [
+                {key: value for key, value in row.items() if key is not None and value != ''}
+                for row in reader
+            ]
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ParseError(detail=f"CSV 파싱 오류 - {e}")
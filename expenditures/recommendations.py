@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+
+from budgets.models import Budget
+from budgets.registry import categories
+from expenditures.aggregates import spend_totals
+from expenditures.filters import adict
+from expenditures.models import DailySpendRollup
+
+# 오늘 지출 추천 계산에 허용되는 쿼리 수 (예산, 카테고리별 지출)
+# 카테고리는 CategoryRegistry에서 읽으므로 포함하지 않는다
+QUERY_BUDGET = 2
+
+
+def generate_recommendation_message(total_recommendation):
+    if total_recommendation == 0:
+        return "오늘은 예산을 모두 사용했어요. 다음에는 더 신중하게 사용해보세요!"
+    elif total_recommendation > 0 and total_recommendation <= 10000:
+        return "잘 아끼고 있을 때, 적당히 사용 중이시네요. 계속 이렇게 가세요!"
+    elif total_recommendation > 10000 and total_recommendation <= 20000:
+        return "기준을 조금 넘었을 때. 조금 더 절약해보는 건 어떨까요?"
+    else:
+        return "예산을 많이 초과하셨어요. 지출을 줄이는 노하우를 찾아보세요!"
+
+
+def budget_queryset(user_id):
+    # 월별 카테고리 예산
+    return Budget.objects.filter(user_id=user_id).values_list('category_id', 'amount')
+
+
+def spent_queryset(user_id, today):
+    # 이전 일자의 카테고리별 지출 합계 (합계 제외 지출 제외)
+    return spend_totals(
+        DailySpendRollup.objects.filter(user_id=user_id, day__lt=today),
+        'category_id',
+        included='category_total',
+        excluded=None,
+    ).values_list('category_id', 'category_total')
+
+
+def build_recommendation(category_names, budget_by_category, spent_by_category, today):
+    remaining_days = (today.replace(day=1) + timedelta(days=31) - today).days
+
+    # 카테고리 별 오늘 지출 가능 금액 계산
+    total_budget = 0
+    category_recommendations = {}
+    for category_id, category_name in category_names.items():
+        category_budget = budget_by_category.get(category_id, 0)
+        category_spent = spent_by_category.get(category_id) or 0
+        total_budget += category_budget
+
+        category_remaining_budget = max(0, category_budget - category_spent)
+        category_daily_budget = category_remaining_budget / remaining_days if remaining_days > 0 else 0
+        category_recommendations[category_name] = round(category_daily_budget)
+
+    # 이전 일자의 과다 소비 고려하여 오늘 예산 계산
+    total_expenditure_before_today = sum(total or 0 for total in spent_by_category.values())
+    remaining_budget = max(0, total_budget - total_expenditure_before_today)
+    daily_budget = remaining_budget / remaining_days if remaining_days > 0 else 0
+
+    total_recommendation = round(daily_budget)
+    return {
+        'total_recommendation': total_recommendation,
+        'category_recommendations': category_recommendations,
+        'message': generate_recommendation_message(total_recommendation),
+    }
+
+
+def recommend_today(user_id, today=None):
+    '''
+    유저의 오늘 지출 가능 금액을 카테고리별로 계산한다.
+    카테고리 수와 관계없이 QUERY_BUDGET 만큼의 쿼리만 사용한다.
+    (뷰와 배치 작업에서 함께 사용)
+    '''
+    today = today or datetime.now().date()
+    return build_recommendation(
+        categories.names(),
+        dict(budget_queryset(user_id)),
+        dict(spent_queryset(user_id, today)),
+        today,
+    )
+
+
+async def arecommend_today(user_id, today=None):
+    '''
+    recommend_today의 async 버전.
+    예산과 지출 합계 쿼리를 함께 기다리지만 thread_sensitive 스레드 하나에서 차례로 실행된다.
+    '''
+    today = today or datetime.now().date()
+    category_names, budget_by_category, spent_by_category = await asyncio.gather(
+        sync_to_async(categories.names)(),
+        adict(budget_queryset(user_id)),
+        adict(spent_queryset(user_id, today)),
+    )
+    return build_recommendation(category_names, budget_by_category, spent_by_category, today)
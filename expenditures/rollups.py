@@ -0,0 +1,170 @@
+from collections import defaultdict
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from expenditures import budget_status, counters
+from expenditures.models import DailySpendRollup, Expenditure
+
+
+def _apply_deltas(deltas):
+    # (user_id, category_id, day) -> [합계, 건수, 합계 제외 합계] 증감분을 집계 행에 반영
+    if not deltas:
+        return
+    with transaction.atomic():
+        counters.apply_counters(deltas)
+        budget_status.prepare_spend(deltas)
+        DailySpendRollup.objects.bulk_create(
+            [
+                DailySpendRollup(user_id=user_id, category_id=category_id, day=day)
+                for user_id, category_id, day in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        for (user_id, category_id, day), (total, count, excluded_total) in deltas.items():
+            DailySpendRollup.objects.filter(user_id=user_id, category_id=category_id, day=day).update(
+                total=F('total') + total,
+                count=F('count') + count,
+                excluded_total=F('excluded_total') + excluded_total,
+            )
+        budget_status.apply_spend({key: total - excluded_total for key, (total, _, excluded_total) in deltas.items()})
+
+
+def _apply(expenditures, sign):
+    # 같은 (user, category, day)의 지출은 메모리에서 먼저 합쳐 집계 행마다 한 번만 갱신
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for expenditure in expenditures:
+        amount = sign * expenditure.expense_amount
+        delta = deltas[(expenditure.user_id, expenditure.category_id, expenditure.expense_day)]
+        delta[0] += amount
+        delta[1] += sign
+        delta[2] += amount if expenditure.is_except else 0
+    _apply_deltas(deltas)
+
+
+def add_expenditure(expenditure):
+    _apply([expenditure], 1)
+
+
+def add_expenditures(expenditures):
+    _apply(expenditures, 1)
+
+
+def remove_expenditure(expenditure):
+    _apply([expenditure], -1)
+
+
+def remove_expenditures(expenditures):
+    _apply(expenditures, -1)
+
+
+def grouped_totals(expenditures):
+    # 지출을 (user, category, day)별 합계, 건수, 합계 제외 합계로 묶는 그룹 쿼리
+    return (
+        expenditures.values('user_id', 'category_id', 'expense_day')
+                    .annotate(
+                        total=Sum('expense_amount'),
+                        count=Count('id'),
+                        excluded_total=Sum('expense_amount', filter=Q(is_except=True)),
+                    )
+                    .order_by()
+    )
+
+
+def _locked_groups(expenditures):
+    # 대상 행을 잠그면서 (user, category, day)별로 묶어 읽는다
+    # (MySQL은 GROUP BY 조회에서도 FOR UPDATE로 읽은 행과 그 사이 구간을 잠근다)
+    return list(grouped_totals(expenditures.select_for_update()))
+
+
+def update_expenditures(expenditures, **values):
+    '''
+    쿼리셋의 지출을 한 번의 UPDATE로 수정하고 같은 트랜잭션에서 집계를 맞춘다. 수정한 건수를 반환한다.
+    values는 category, memo, is_except만 허용한다. 수정 후 값은 모든 행에 같으므로
+    집계 증감분은 수정 전 그룹 쿼리 결과에서 바로 계산한다.
+    '''
+    category = values.get('category')
+    category_id = getattr(category, 'pk', category)
+    is_except = values.get('is_except')
+
+    with transaction.atomic():
+        groups = _locked_groups(expenditures)
+        # update()는 auto_now를 거치지 않으므로 수정일시를 직접 지정
+        updated = expenditures.update(**values, updated_at=datetime.now())
+
+        deltas = defaultdict(lambda: [0, 0, 0])
+        for row in groups:
+            total, count, excluded_total = row['total'], row['count'], row['excluded_total'] or 0
+            before = deltas[(row['user_id'], row['category_id'], row['expense_day'])]
+            before[0] -= total
+            before[1] -= count
+            before[2] -= excluded_total
+
+            after = deltas[(row['user_id'], category_id or row['category_id'], row['expense_day'])]
+            after[0] += total
+            after[1] += count
+            after[2] += excluded_total if is_except is None else (total if is_except else 0)
+        _apply_deltas({key: delta for key, delta in deltas.items() if any(delta)})
+    return updated
+
+
+def delete_expenditures(expenditures):
+    # 쿼리셋의 지출을 한 번의 DELETE로 삭제하고 같은 트랜잭션에서 집계를 맞춘다. 삭제한 건수를 반환한다.
+    with transaction.atomic():
+        groups = _locked_groups(expenditures)
+        deleted, _ = expenditures.delete()
+        _apply_deltas({
+            (row['user_id'], row['category_id'], row['expense_day']): [-row['total'], -row['count'], -(row['excluded_total'] or 0)]
+            for row in groups
+        })
+    return deleted
+
+
+def replace_expenditure(previous, expenditure):
+    # 수정 전 스냅샷을 빼고 수정 후 값을 더한다
+    with transaction.atomic():
+        remove_expenditure(previous)
+        add_expenditure(expenditure)
+
+
+def rebuild_rollups(user=None, batch_size=1000, user_ids=None):
+    '''
+    원본 지출 내역으로부터 집계 테이블, 이번 달 예산 스냅샷, 유저별 총액 카운터를 다시 만든다. (백필 / 불일치 복구용)
+    user 또는 user_ids가 주어지면 해당 유저의 집계만 다시 만든다.
+    '''
+    if user is not None:
+        user_ids = [user.pk]
+    expenditures = Expenditure.objects.all()
+    rollups = DailySpendRollup.objects.all()
+    if user_ids is not None:
+        expenditures = expenditures.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    rows = grouped_totals(expenditures)
+
+    created = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(DailySpendRollup(
+                user_id=row['user_id'],
+                category_id=row['category_id'],
+                day=row['expense_day'],
+                total=row['total'],
+                count=row['count'],
+                excluded_total=row['excluded_total'] or 0,
+            ))
+            if len(batch) >= batch_size:
+                DailySpendRollup.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            DailySpendRollup.objects.bulk_create(batch)
+            created += len(batch)
+
+        budget_status.rebuild_month(user_ids=user_ids)
+        counters.reconcile_counters(user_ids=user_ids, batch_size=batch_size)
+
+    return created
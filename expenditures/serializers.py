@@ -1,6 +1,14 @@
+import json
+
 from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
 from expenditures.models import Expenditure
 
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
 class ExpenditureSerializer(serializers.ModelSerializer):
     class Meta:
         model = Expenditure
@@ -13,3 +21,75 @@ class ExpenditureSerializer(serializers.ModelSerializer):
             'user', 
             'category'
         )
+        # 지출의 유저는 요청한 유저로 저장한다
+        read_only_fields = ('user',)
+
+
+class ExpenditureBatchUpdateSerializer(serializers.ModelSerializer):
+    # 일괄 수정에서 바꿀 수 있는 필드 (지출일/금액은 건별 수정으로만 변경)
+    class Meta:
+        model = Expenditure
+        fields = ('category', 'memo', 'is_except')
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('수정할 필드(category, memo, is_except)가 필요합니다.')
+        return attrs
+
+
+class ExpenditureRowSerializer:
+    '''
+    ExpenditureSerializer와 같은 결과를 내는 읽기 전용 serializer
+    모델 인스턴스와 필드별 serializer를 만들지 않고 values_list() 튜플을 바로 dict로 변환한다.
+    '''
+    fields = ExpenditureSerializer.Meta.fields
+    columns = (
+        'id',
+        'expense_date',
+        'expense_amount',
+        'memo',
+        'is_except',
+        'user_id',
+        'category_id'
+    )
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values_list(*cls.columns)
+
+    @staticmethod
+    def format_datetime(value):
+        # rest_framework.fields.DateTimeField.to_representation 과 같은 ISO 8601 형식
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    @classmethod
+    def to_representation(cls, row):
+        id, expense_date, expense_amount, memo, is_except, user_id, category_id = row
+        return {
+            'id': id,
+            'expense_date': cls.format_datetime(expense_date) if expense_date is not None else None,
+            'expense_amount': expense_amount,
+            'memo': memo,
+            'is_except': is_except,
+            'user': user_id,
+            'category': category_id,
+        }
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
+
+
+def dumps(data):
+    # rest_framework JSONRenderer 기본값(compact, unicode)과 같은 바이트를 만든다
+    # JSONRenderer처럼 U+2028, U+2029는 JavaScript 호환을 위해 이스케이프한다
+    if orjson is not None:
+        return orjson.dumps(data).replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    ret = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+from django.db.models import DateField, F
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ParseError
+
+from budgets.registry import categories
+from expenditures.aggregates import spend_totals
+from expenditures.models import DailySpendRollup
+
+# 한 번에 반환할 수 있는 최대 구간 수
+MAX_BUCKETS = 400
+
+DEFAULT_SPANS = {
+    'day': timedelta(days=29),
+    'week': timedelta(weeks=11),
+    'month': timedelta(days=334),
+}
+
+
+def bucket_start(day, interval):
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, interval):
+    if interval == 'day':
+        return start + timedelta(days=1)
+    if interval == 'week':
+        return start + timedelta(weeks=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def parse_day(value, name):
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        parsed = parse_datetime(value)
+        day = parsed.date() if parsed else None
+    if day is None:
+        raise ParseError(f'{name}는 YYYY-MM-DD 형식이어야 합니다.')
+    return day
+
+
+def build_series(user_id, query_params):
+    '''
+    유저의 지출을 day/week/month 구간별로 합산한다.
+    - interval: day(기본) | week | month
+    - start_date, end_date: 기간 (기본값: 오늘까지 interval별 30일 / 12주 / 12개월)
+    - split=category: 카테고리별 합계 포함
+    - include_except=true: 합계 제외(is_except) 지출도 포함
+    일별 집계를 한 번의 그룹 쿼리로 구간별로 묶고, 지출이 없는 구간은 0으로 채운다.
+    '''
+    interval = query_params.get('interval', 'day')
+    if interval not in DEFAULT_SPANS:
+        raise ParseError('interval은 day, week, month 중 하나여야 합니다.')
+
+    end = parse_day(query_params.get('end_date'), 'end_date') or datetime.now().date()
+    start = parse_day(query_params.get('start_date'), 'start_date') or end - DEFAULT_SPANS[interval]
+    if start > end:
+        raise ParseError('start_date는 end_date보다 늦을 수 없습니다.')
+
+    # 구간 목록 (gap-filling 기준)
+    buckets = []
+    current = bucket_start(start, interval)
+    while current <= end:
+        buckets.append(current)
+        if len(buckets) > MAX_BUCKETS:
+            raise ParseError(f'구간은 {MAX_BUCKETS}개 이하여야 합니다.')
+        current = next_bucket(current, interval)
+
+    split = query_params.get('split') == 'category'
+    include_except = query_params.get('include_except', 'false').lower() == 'true'
+
+    bucket = {
+        'day': F('day'),
+        'week': TruncWeek('day', output_field=DateField()),
+        'month': TruncMonth('day', output_field=DateField()),
+    }[interval]
+    rows = spend_totals(
+        DailySpendRollup.objects.filter(user_id=user_id, day__range=(start, end)).annotate(bucket=bucket),
+        'bucket',
+        *(['category_id'] if split else []),
+    )
+
+    totals = {start: 0 for start in buckets}
+    category_totals = {start: {} for start in buckets}
+    for row in rows:
+        amount = row['spent'] + (row['excluded_spent'] if include_except else 0)
+        totals[row['bucket']] += amount
+        if split:
+            category_totals[row['bucket']][row['category_id']] = amount
+
+    series = []
+    if split:
+        category_names = categories.names()
+        used = sorted({category_id for values in category_totals.values() for category_id in values})
+    for start in buckets:
+        point = {'start': start, 'total': totals[start]}
+        if split:
+            point['categories'] = {
+                category_names.get(category_id, str(category_id)): category_totals[start].get(category_id, 0)
+                for category_id in used
+            }
+        series.append(point)
+
+    return {
+        'interval': interval,
+        'start_date': start,
+        'end_date': end,
+        'series': series,
+    }
@@ -0,0 +1,137 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+
+from auths.models import User
+from budgets.registry import categories
+from expenditures.aggregates import ROLLUP_INCLUDED_AMOUNT, spend_totals
+from expenditures.models import DailySpendRollup, MonthlySpendDistribution
+
+
+def month_range(month_start):
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    return month_start, next_month_start - timedelta(days=1)
+
+
+def refresh_distribution(month_start):
+    '''
+    한 달 동안의 유저별 지출 합계 분포(평균, 백분위)를 계산해 저장한다.
+    요청마다 전체 유저를 집계하지 않도록 주기적으로(또는 해당 월 첫 조회 시 한 번) 실행한다.
+    '''
+    totals = sorted(
+        spend_totals(
+            DailySpendRollup.objects.filter(day__range=month_range(month_start)),
+            'user_id',
+            included='user_total',
+            excluded=None,
+        ).values_list('user_total', flat=True)
+    )
+
+    percentiles = []
+    if totals:
+        last = len(totals) - 1
+        percentiles = [totals[round(last * percent / 100)] for percent in range(101)]
+
+    distribution, _ = MonthlySpendDistribution.objects.update_or_create(
+        month=month_start,
+        defaults={
+            'user_count': len(totals),
+            'average': sum(totals) / len(totals) if totals else 0,
+            'percentiles': percentiles,
+        },
+    )
+    return distribution
+
+
+def get_distribution(month_start):
+    '''
+    해당 월(없으면 그 이전 중 가장 최근 월)에 저장된 분포를 반환한다. 저장된 분포가 없으면 None
+    요청 중에는 전체 유저를 집계하지 않는다. (refresh_spend_distribution 명령으로 미리 계산)
+    '''
+    return MonthlySpendDistribution.objects.filter(month__lte=month_start).order_by('-month').first()
+
+
+def percentile_rank(distribution, amount):
+    # amount보다 적게 지출한 유저의 대략적인 비율 (0~100)
+    if distribution is None or not distribution.percentiles:
+        return None
+    return min(100, bisect_left(distribution.percentiles, amount))
+
+
+def counted_month_total(user_id, month_start):
+    # 유저 카운터(User.month_total)의 해당 월 총액. 카운터가 다른 달 값이면 None
+    row = User.objects.filter(pk=user_id).values_list('month_total', 'month_total_month').first()
+    if row is None or row[1] != month_start:
+        return None
+    return row[0]
+
+
+def ratio(numerator, denominator):
+    return round(numerator / denominator * 100, 2) if denominator > 0 else 0
+
+
+def build_statistics(user_id, today=None):
+    '''
+    유저의 지출 통계를 계산한다.
+    - total_last_month / category_ratios: 지난 달 총액과 카테고리별 비율
+    - total_this_month / last_month_ratio: 이번 달 총액과 지난 달 같은 기간 대비 비율
+    - last_weekday_ratio: 지난 주 같은 요일 대비 오늘 소비율
+    - other_users_ratio / peer_percentile: 지난 달 전체 유저 평균 대비 비율과 백분위
+      (미리 계산된 분포 사용, 지난 달 분포가 아직 없으면 가장 최근 분포, 하나도 없으면 0 / None)
+    이번 달 총액은 유저 카운터(User.month_total)에서 읽고, 일별 집계는 지난 달과 오늘 / 지난 주 같은 요일만
+    한 번 조회해 한 번의 순회로 모두 계산한다. 카운터를 쓸 수 없으면(지난 날짜 기준 조회 등) 이번 달 일별 집계도 읽는다.
+    '''
+    today = today or datetime.now().date()
+    this_month_start = today.replace(day=1)
+    last_month_start, last_month_end = month_range((this_month_start - timedelta(days=1)).replace(day=1))
+    last_week_day = today - timedelta(days=7)
+    # 지난 달 같은 기간의 마지막 날 (지난 달이 더 짧으면 말일)
+    last_month_same_day = min(last_month_end, last_month_start + timedelta(days=today.day - 1))
+
+    category_names = categories.names()
+
+    total_last_month = 0
+    total_last_month_to_date = 0
+    total_this_month = counted_month_total(user_id, this_month_start) if today == datetime.now().date() else None
+    total_today = 0
+    total_last_week_day = 0
+    category_amounts = defaultdict(int)
+
+    if total_this_month is None:
+        count_this_month = True
+        total_this_month = 0
+        days = Q(day__gte=min(last_month_start, last_week_day), day__lte=today)
+    else:
+        count_this_month = False
+        days = Q(day__range=(last_month_start, last_month_end)) | Q(day__in=[today, last_week_day])
+    rows = DailySpendRollup.objects.filter(days, user_id=user_id).values_list('category_id', 'day', ROLLUP_INCLUDED_AMOUNT)
+
+    for category_id, day, total in rows:
+        if last_month_start <= day <= last_month_end:
+            total_last_month += total
+            category_amounts[category_id] += total
+            if day <= last_month_same_day:
+                total_last_month_to_date += total
+        if count_this_month and day >= this_month_start:
+            total_this_month += total
+        if day == today:
+            total_today += total
+        elif day == last_week_day:
+            total_last_week_day += total
+
+    distribution = get_distribution(last_month_start)
+
+    return {
+        'total_last_month': total_last_month,
+        'category_ratios': {
+            name: ratio(category_amounts[category_id], total_last_month)
+            for category_id, name in category_names.items()
+        },
+        'total_this_month': total_this_month,
+        'last_month_ratio': ratio(total_this_month, total_last_month_to_date),
+        'last_weekday_ratio': ratio(total_today, total_last_week_day),
+        'other_users_ratio': ratio(total_last_month, distribution.average if distribution else 0),
+        'peer_percentile': percentile_rank(distribution, total_last_month),
+    }
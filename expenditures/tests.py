@@ -1,3 +1,1070 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import tempfile
+from datetime import date, datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auths.models import User
+from budgets.models import Category, Budget
+from budgets.registry import categories
+from config.cache import bump_category_version, bump_user_version, get_versions, user_version_key
+from config.metrics import registry
+from config.routers import ReplicaRouter, use_replica
+from expenditures import async_views, rollups
+from expenditures.budget_status import current_month, rebuild_month
+from expenditures.counters import reconcile_counters
+from expenditures.models import DailySpendRollup, Expenditure, MonthlyBudgetStatus, MonthlySpendDistribution
+from expenditures.notifications import notify_today
+from expenditures.pagination import encode_cursor
+from expenditures.recommendations import QUERY_BUDGET, recommend_today
+from expenditures.serializers import ExpenditureRowSerializer, ExpenditureSerializer, dumps
+from expenditures.statistics import build_statistics, refresh_distribution
+
+
+class TodayRecommendationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.today = date(2023, 11, 21)
+        for index, name in enumerate(['식비', '교통', '여가', '쇼핑', '기타']):
+            category = Category.objects.create(name=name)
+            Budget.objects.create(user=self.user, category=category, amount=100000 * (index + 1))
+            expenditure = Expenditure.objects.create(
+                user=self.user,
+                category=category,
+                expense_date=datetime(2023, 11, 1) + timedelta(days=index),
+                expense_amount=10000,
+            )
+            rollups.add_expenditure(expenditure)
+
+    def test_recommendation_amounts(self):
+        result = recommend_today(self.user.pk, today=self.today)
+
+        remaining_days = 11
+        self.assertEqual(result['category_recommendations']['식비'], round(90000 / remaining_days))
+        self.assertEqual(result['total_recommendation'], round((1500000 - 50000) / remaining_days))
+
+    def test_query_budget_does_not_grow_with_categories(self):
+        categories.names()  # 카테고리 목록을 미리 읽어 둔다
+        with self.assertNumQueries(QUERY_BUDGET):
+            recommend_today(self.user.pk, today=self.today)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(20):
+                Category.objects.create(name=f'추가{index}')
+            bump_category_version()
+
+        categories.names()
+        with self.assertNumQueries(QUERY_BUDGET):
+            result = recommend_today(self.user.pk, today=self.today)
+        self.assertEqual(len(result['category_recommendations']), 25)
+
+    def test_view_query_budget(self):
+        categories.names()
+        with self.assertNumQueries(QUERY_BUDGET):
+            response = self.client.get('/api/expenditures/rec/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['category_recommendations']), 5)
+
+
+class AsyncViewsTest(TransactionTestCase):
+    # async ORM 쿼리는 별도 스레드의 DB 연결을 사용하므로 테스트 트랜잭션으로 감싸지 않는다
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.auth = f'Bearer {AccessToken.for_user(self.user)}'
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+
+        for index, name in enumerate(['식비', '교통']):
+            category = Category.objects.create(name=name)
+            Budget.objects.create(user=self.user, category=category, amount=100000)
+            for day in range(3):
+                rollups.add_expenditure(Expenditure.objects.create(
+                    user=self.user,
+                    category=category,
+                    expense_date=datetime.now() - timedelta(days=day),
+                    expense_amount=1000 * (index + 1),
+                ))
+
+    async def test_matches_sync_views(self):
+        factory = AsyncRequestFactory()
+        for path, view in [
+            ('/api/expenditures/?page_size=2', async_views.expenditure_list),
+            ('/api/expenditures/rec/', async_views.today_recommendation),
+            ('/api/expenditures/noti/', async_views.noti_today_expenditure),
+        ]:
+            response = await view(factory.get(path, headers={'Authorization': self.auth}))
+            self.assertEqual(response.status_code, 200, response.content)
+
+            await cache.aclear()
+            expected = await sync_to_async(self.client.get)(path)
+            self.assertEqual(json.loads(response.content), json.loads(expected.content), path)
+
+    async def test_conditional_get(self):
+        factory = AsyncRequestFactory()
+        first = await async_views.expenditure_list(factory.get('/api/expenditures/', headers={'Authorization': self.auth}))
+        response = await async_views.expenditure_list(factory.get(
+            '/api/expenditures/',
+            headers={'Authorization': self.auth, 'If-None-Match': first['ETag']},
+        ))
+        self.assertEqual(response.status_code, 304)
+
+        # 동기 뷰와 같은 ETag
+        expected = await sync_to_async(self.client.get)('/api/expenditures/')
+        self.assertEqual(first['ETag'], expected['ETag'])
+
+    async def test_requires_token(self):
+        response = await async_views.expenditure_list(AsyncRequestFactory().get('/api/expenditures/'))
+        self.assertEqual(response.status_code, 401)
+
+
+class ExpenditureListTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        other = User.objects.create_user(username='user2', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        food = Category.objects.create(name='식비')
+
+        # 같은 지출일시가 섞여 있어도 (expense_date, id) 순서로 빠짐없이 나눠야 한다
+        dates = [datetime(2023, 11, 21, 12), datetime(2023, 11, 20, 9), datetime(2023, 11, 21, 12),
+                 datetime(2023, 11, 22, 8), datetime(2023, 11, 20, 9), datetime(2023, 11, 21, 12), datetime(2023, 11, 22, 8)]
+        expenditures = [
+            Expenditure.objects.create(user=self.user, category=food, expense_date=expense_date, expense_amount=1000 * (index + 1))
+            for index, expense_date in enumerate(dates)
+        ]
+        Expenditure.objects.create(user=other, category=food, expense_date=datetime(2023, 11, 21, 12), expense_amount=500)
+        self.expected_ids = [
+            expenditure.id for expenditure in sorted(expenditures, key=lambda e: (e.expense_date, e.id), reverse=True)
+        ]
+
+    def test_cursor_walks_every_row_once(self):
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {'page_size': 2, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get('/api/expenditures/', params)
+            self.assertEqual(response.status_code, 200)
+            # 합계는 첫 페이지에만 포함
+            self.assertEqual('total_expense' in response.data, pages == 0)
+            ids += [row['id'] for row in response.data['expenditures']]
+            pages += 1
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(pages, 4)
+
+    @override_settings(EXPENDITURE_PAGE_SIZE=4, EXPENDITURE_MAX_PAGE_SIZE=5)
+    def test_page_size_default_and_cap(self):
+        response = self.client.get('/api/expenditures/')
+        self.assertEqual([row['id'] for row in response.data['expenditures']], self.expected_ids[:4])
+
+        response = self.client.get('/api/expenditures/', {'page_size': 100})
+        self.assertEqual(len(response.data['expenditures']), 5)
+        self.assertIsNotNone(response.data['next_cursor'])
+
+    def test_invalid_cursor_and_page_size(self):
+        bad_cursors = [
+            'not-a-cursor',
+            encode_cursor(datetime(2023, 11, 21), 1)[:-4],
+            base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+            base64.urlsafe_b64encode(b'["2023-11-21T12:00:00", "1"]').decode(),
+        ]
+        for cursor in bad_cursors:
+            self.assertEqual(self.client.get('/api/expenditures/', {'cursor': cursor}).status_code, 400, cursor)
+        for page_size in ['abc', '0', '-1']:
+            self.assertEqual(self.client.get('/api/expenditures/', {'page_size': page_size}).status_code, 400, page_size)
+
+    def test_stream_ndjson(self):
+        totals = self.client.get('/api/expenditures/', {'page_size': 1}).json()
+
+        response = self.client.get('/api/expenditures/', {'stream': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+        # 합계 한 줄 뒤에 지출이 KEYSET_ORDERING 순서로 한 줄에 한 건씩
+        self.assertEqual(lines[0], {key: totals[key] for key in ('total_expense', 'total_excluded', 'category_totals')})
+        self.assertEqual([line['id'] for line in lines[1:]], self.expected_ids)
+
+        response = self.client.get('/api/expenditures/', {'stream': 'ndjson', 'totals': 'false'})
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([line['id'] for line in lines], self.expected_ids)
+
+
+class ExpenditureRowSerializerTest(TestCase):
+    def test_output_is_byte_identical_to_model_serializer(self):
+        user = User.objects.create_user(username='user1', password='devpassword1')
+        category = Category.objects.create(name='식비')
+        Expenditure.objects.create(user=user, category=category, expense_date=datetime(2023, 11, 21, 9, 30), expense_amount=12000, memo='점심 "김밥"')
+        Expenditure.objects.create(user=user, category=category, expense_date=datetime(2023, 11, 21, 18, 0, 0, 1234), expense_amount=0, is_except=True)
+        Expenditure.objects.create(user=user, category=category, expense_date=datetime(2023, 11, 22, 9, 0), expense_amount=500, memo='줄\u2028바꿈\u2029문단')
+
+        queryset = Expenditure.objects.order_by('id')
+        renderer = JSONRenderer()
+
+        self.assertEqual(
+            renderer.render(ExpenditureRowSerializer(ExpenditureRowSerializer.values(queryset)).data),
+            renderer.render(ExpenditureSerializer(queryset, many=True).data),
+        )
+        for row, expenditure in zip(ExpenditureRowSerializer.values(queryset), queryset):
+            expected = renderer.render(ExpenditureSerializer(expenditure).data)
+            self.assertEqual(dumps(ExpenditureRowSerializer.to_representation(row)), expected)
+            # orjson이 없을 때의 표준 json 경로
+            with mock.patch('expenditures.serializers.orjson', None):
+                self.assertEqual(dumps(ExpenditureRowSerializer.to_representation(row)), expected)
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='식비')
+        Budget.objects.create(user=self.user, category=self.category, amount=300000)
+
+    def test_cached_until_user_writes(self):
+        first = self.client.get('/api/expenditures/rec/')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/expenditures/rec/').data, first.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/expenditures/', {
+                'expense_date': '2000-01-01T12:00:00',
+                'expense_amount': 300000,
+                'category': self.category.id,
+                'user': self.user.id,
+            }, format='json')
+
+        categories.names()
+        with self.assertNumQueries(QUERY_BUDGET):
+            second = self.client.get('/api/expenditures/rec/')
+        self.assertEqual(second.data['total_recommendation'], 0)
+
+    def test_category_list_invalidated_on_write(self):
+        self.assertEqual(len(self.client.get('/api/budgets//').data), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/budgets//', {'name': '교통'}, format='json')
+        self.assertEqual(len(self.client.get('/api/budgets//').data), 2)
+
+
+class StatisticsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.other = User.objects.create_user(username='user2', password='devpassword1')
+        self.food = Category.objects.create(name='식비')
+        self.traffic = Category.objects.create(name='교통')
+
+        self.expend(self.user, self.food, datetime(2023, 10, 5), 30000)
+        self.expend(self.user, self.traffic, datetime(2023, 10, 25), 10000)
+        self.expend(self.user, self.food, datetime(2023, 11, 14), 5000)
+        self.expend(self.user, self.food, datetime(2023, 11, 21), 10000)
+        self.expend(self.other, self.food, datetime(2023, 10, 10), 80000)
+
+    def expend(self, user, category, expense_date, amount):
+        rollups.add_expenditure(Expenditure.objects.create(
+            user=user,
+            category=category,
+            expense_date=expense_date,
+            expense_amount=amount,
+        ))
+
+    def test_statistics(self):
+        call_command('refresh_spend_distribution', month='2023-10', stdout=io.StringIO())
+        result = build_statistics(self.user.pk, today=date(2023, 11, 21))
+
+        self.assertEqual(result['total_last_month'], 40000)
+        self.assertEqual(result['category_ratios'], {'식비': 75.0, '교통': 25.0})
+        self.assertEqual(result['total_this_month'], 15000)
+        self.assertEqual(result['last_month_ratio'], 50.0)
+        self.assertEqual(result['last_weekday_ratio'], 200.0)
+        self.assertEqual(result['other_users_ratio'], 66.67)
+        self.assertEqual(result['peer_percentile'], 0)
+
+    def test_distribution_is_precomputed(self):
+        categories.names()
+        # 분포가 없어도 요청 중에 전체 유저를 집계하지 않는다 (일별 집계, 분포 조회)
+        with self.assertNumQueries(2):
+            result = build_statistics(self.user.pk, today=date(2023, 11, 21))
+        self.assertEqual((result['other_users_ratio'], result['peer_percentile']), (0, None))
+        self.assertFalse(MonthlySpendDistribution.objects.exists())
+
+        # 지난 달 분포가 아직 없으면 가장 최근에 저장된 분포를 사용
+        refresh_distribution(date(2023, 9, 1))
+        MonthlySpendDistribution.objects.update(average=20000, percentiles=[0] * 101)
+        with self.assertNumQueries(2):
+            result = build_statistics(self.other.pk, today=date(2023, 11, 21))
+        self.assertEqual(result['other_users_ratio'], 400.0)
+        self.assertEqual(result['peer_percentile'], 100)
+
+
+@override_settings(DATABASE_REPLICA='replica')
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.router = ReplicaRouter()
+
+    def read_alias(self):
+        class View:
+            @use_replica
+            def get(self, request):
+                return ReplicaRouter().db_for_read(Expenditure)
+
+        request = type('Request', (), {'user': self.user})()
+        return View().get(request)
+
+    def test_aggregate_reads_go_to_replica(self):
+        self.assertEqual(self.read_alias(), 'replica')
+        self.assertIsNone(self.router.db_for_read(Expenditure))
+        self.assertEqual(self.router.db_for_write(Expenditure), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'expenditures'))
+
+    def test_reads_pinned_to_primary_after_write(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_user_version(self.user.pk)
+        self.assertIsNone(self.read_alias())
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Budget.objects.create(user=self.user, category=Category.objects.create(name='식비'), amount=300000)
+
+    def test_per_view_metrics(self):
+        self.client.get('/api/expenditures/rec/')
+        self.client.get('/api/expenditures/rec/')
+
+        body = self.client.get('/metrics').content.decode()
+        view = 'view="api/expenditures/rec/"'
+        self.assertIn(f'http_requests_total{{{view},method="GET",status="200"}} 2', body)
+        self.assertIn(f'http_request_cache_total{{{view},result="hit"}} 1', body)
+        self.assertIn(f'http_request_db_queries_count{{{view}}} 2', body)
+        self.assertIn('response_cache_total{namespace="recommendation",result="miss"}', body)
+
+        # 첫 요청만 DB를 조회한다 (카테고리 + QUERY_BUDGET)
+        self.assertEqual(registry.query_count['api/expenditures/rec/'].sum, QUERY_BUDGET + 1)
+
+    @override_settings(METRICS_QUERY_COUNT_THRESHOLD=0)
+    def test_query_budget_exceeded_is_logged(self):
+        with self.assertLogs('metrics', level='WARNING') as logs:
+            self.client.get('/api/expenditures/rec/')
+        self.assertIn('query_budget_exceeded', logs.output[0])
+        self.assertEqual(registry.query_budget_exceeded['api/expenditures/rec/'], 1)
+
+    def test_writes_within_view_query_budget(self):
+        category = Category.objects.get(name='식비')
+        with self.assertNoLogs('metrics', level='WARNING'):
+            expenditure = self.client.post('/api/expenditures/', {
+                'expense_date': datetime.now().isoformat(),
+                'expense_amount': 1000,
+                'category': category.id,
+            }, format='json').data
+            self.client.put(f'/api/expenditures/{expenditure["id"]}/', {**expenditure, 'expense_amount': 2000}, format='json')
+            self.client.delete(f'/api/expenditures/{expenditure["id"]}/')
+
+    def test_metrics_view_allowlist(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 404)
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.0/8']):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 200)
+
+
+class BenchCommandTest(TestCase):
+    def test_bench_reports_every_endpoint(self):
+        cache.clear()
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'bench',
+                users=2,
+                expenditures_per_user=20,
+                requests=150,
+                output=output.name,
+                stdout=io.StringIO(),
+            )
+            result = json.load(output)
+
+        self.assertEqual(sum(stats['requests'] for stats in result['endpoints'].values()), 150)
+        for name, stats in result['endpoints'].items():
+            self.assertTrue(all(status.startswith('2') for status in stats['statuses']), (name, stats))
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+        self.assertIsNotNone(result['endpoints']['expenditures.rec']['queries_per_request'])
+
+    def test_rerun_measures_same_dataset(self):
+        cache.clear()
+        results = []
+        for _ in range(2):
+            with tempfile.NamedTemporaryFile(suffix='.json') as output:
+                call_command(
+                    'bench',
+                    users=2,
+                    expenditures_per_user=20,
+                    base_date='2023-11-21',
+                    requests=50,
+                    output=output.name,
+                    stdout=io.StringIO(),
+                )
+                results.append(json.load(output))
+
+        # 이전 실행에서 생성/삭제한 지출이 남지 않고 다시 생성한 데이터로 측정한다
+        self.assertEqual(results[0]['dataset'], {'users': 2, 'expenditures': 40})
+        self.assertEqual(results[1]['dataset'], results[0]['dataset'])
+
+
+class BudgetStatusTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = Category.objects.create(name='식비')
+        self.transport = Category.objects.create(name='교통')
+        Budget.objects.create(user=self.user, category=self.food, amount=300000)
+
+    def snapshot(self):
+        return dict(
+            MonthlyBudgetStatus.objects.filter(user=self.user, month=current_month())
+                                       .values_list('category_id', 'spent_to_date')
+        )
+
+    def post(self, category, amount, expense_date=None):
+        return self.client.post('/api/expenditures/', {
+            'expense_date': (expense_date or datetime.now()).isoformat(),
+            'expense_amount': amount,
+            'category': category.id,
+        }, format='json').data
+
+    def test_kept_current_on_writes(self):
+        first = self.post(self.food, 10000)
+        self.post(self.transport, 5000)
+        self.post(self.food, 7000, expense_date=datetime.now() - timedelta(days=40))
+        self.assertEqual(self.snapshot(), {self.food.id: 10000, self.transport.id: 5000})
+
+        self.client.put(f'/api/expenditures/{first["id"]}/', {**first, 'category': self.transport.id}, format='json')
+        self.assertEqual(self.snapshot(), {self.food.id: 0, self.transport.id: 15000})
+
+        self.client.delete(f'/api/expenditures/{first["id"]}/')
+        expected = self.snapshot()
+        rebuild_month(user=self.user)
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_noti_reads_snapshot(self):
+        self.post(self.food, 10000)
+        self.client.put('/api/budgets/rec/', {'budgets': {'식비': {'amount': 600000, 'ratio': 100}}}, format='json')
+
+        categories.names()
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/expenditures/noti/')
+        stats = {stat['category_name']: stat for stat in response.data['category_stats']}
+        self.assertEqual(stats['식비']['today_expense_amount'], 10000)
+        self.assertGreater(stats['식비']['today_appropriate_amount'], 0)
+        self.assertEqual(stats['교통']['today_expense_amount'], 0)
+
+    def test_month_rollover_computed_from_rollups(self):
+        self.post(self.food, 10000)
+        MonthlyBudgetStatus.objects.all().delete()
+
+        response = self.client.get('/api/expenditures/noti/')
+        stats = {stat['category_name']: stat for stat in response.data['category_stats']}
+        self.assertEqual(stats['식비']['today_expense_amount'], 10000)
+        # 조회는 스냅샷 행을 만들지 않는다 (월 초 명령 또는 다음 쓰기에서 생성)
+        self.assertEqual(self.snapshot(), {})
+
+        call_command('roll_budget_status', stdout=io.StringIO())
+        self.assertEqual(self.snapshot(), {self.food.id: 10000})
+
+    def test_batch_api_is_admin_only(self):
+        other = User.objects.create_user(username='user2', password='devpassword1')
+        self.post(self.food, 10000)
+        self.assertEqual(self.client.get(f'/api/expenditures/status/?user_ids={self.user.pk}').status_code, 403)
+
+        admin = User.objects.create_user(username='admin', password='devpassword1', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get(f'/api/expenditures/status/?user_ids={self.user.pk},{other.pk}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['users'][other.pk], [])
+        food, = response.data['users'][self.user.pk]
+        self.assertEqual((food['budget'], food['spent_to_date']), (300000, 10000))
+
+        self.assertEqual(client.get('/api/expenditures/status/?user_ids=a').status_code, 400)
+
+
+class SendDailyNotificationsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = datetime.now().date()
+        self.users = [User.objects.create_user(username=f'user{index}', password='devpassword1') for index in range(3)]
+        food = Category.objects.create(name='식비')
+        transport = Category.objects.create(name='교통')
+        for index, user in enumerate(self.users[:2]):
+            Budget.objects.create(user=user, category=food, amount=300000 * (index + 1))
+            Budget.objects.create(user=user, category=transport, amount=100000)
+            for days in range(3):
+                rollups.add_expenditure(Expenditure.objects.create(
+                    user=user,
+                    category=food,
+                    expense_date=datetime.now() - timedelta(days=days),
+                    expense_amount=1000 * (index + days + 1),
+                ))
+
+    def run_command(self, **options):
+        with tempfile.NamedTemporaryFile(suffix='.jsonl') as output:
+            call_command('send_daily_notifications', sink=f'file:{output.name}', stderr=io.StringIO(), **options)
+            return [json.loads(line) for line in open(output.name, encoding='utf-8')]
+
+    def test_matches_per_user_endpoints(self):
+        categories.names()
+        # 예산, 이전 지출, 오늘 지출, 스냅샷 + 유저 목록 청크 조회 2번
+        with self.assertNumQueries(6):
+            messages = self.run_command(chunk_size=10)
+
+        self.assertEqual([message['user_id'] for message in messages], [user.pk for user in self.users[:2]])
+        for message in messages:
+            self.assertEqual(message['recommendation'], recommend_today(message['user_id'], today=self.today))
+            self.assertEqual(message['noti'], notify_today(message['user_id'], today=self.today))
+
+    def test_chunks_and_workers(self):
+        expected = self.run_command(chunk_size=10)
+        self.assertEqual(self.run_command(chunk_size=1), expected)
+        self.assertEqual(self.run_command(chunk_size=1, workers=2), expected)
+
+
+class ExpenditureSeriesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        food = Category.objects.create(name='식비')
+        transport = Category.objects.create(name='교통')
+        for expense_date, category, amount, is_except in [
+            (datetime(2023, 10, 30, 9), food, 1000, False),
+            (datetime(2023, 11, 1, 9), food, 2000, False),
+            (datetime(2023, 11, 1, 18), transport, 3000, False),
+            (datetime(2023, 11, 3, 12), food, 4000, True),
+            (datetime(2023, 11, 15, 12), transport, 5000, False),
+        ]:
+            rollups.add_expenditure(Expenditure.objects.create(
+                user=self.user, category=category, expense_date=expense_date, expense_amount=amount, is_except=is_except,
+            ))
+
+    def get(self, **params):
+        return self.client.get('/api/expenditures/series/', {'start_date': '2023-10-30', 'end_date': '2023-11-19', **params})
+
+    def test_day_buckets_are_gap_filled(self):
+        with self.assertNumQueries(1):
+            response = self.get()
+        series = response.data['series']
+        self.assertEqual(len(series), 21)
+        self.assertEqual([point['total'] for point in series[:5]], [1000, 0, 5000, 0, 0])
+
+    def test_week_and_month_buckets(self):
+        weeks = self.get(interval='week').data['series']
+        self.assertEqual([(str(point['start']), point['total']) for point in weeks], [
+            ('2023-10-30', 6000), ('2023-11-06', 0), ('2023-11-13', 5000),
+        ])
+        months = self.get(interval='month', include_except='true').data['series']
+        self.assertEqual([point['total'] for point in months], [1000, 14000])
+
+    def test_split_by_category(self):
+        weeks = self.get(interval='week', split='category').data['series']
+        self.assertEqual(weeks[0]['categories'], {'식비': 3000, '교통': 3000})
+        self.assertEqual(weeks[1]['categories'], {'식비': 0, '교통': 0})
+
+    def test_invalid_params(self):
+        self.assertEqual(self.get(interval='year').status_code, 400)
+        self.assertEqual(self.get(start_date='2000-01-01').status_code, 400)
+        self.assertEqual(self.get(end_date='soon').status_code, 400)
+
+
+class IsExceptTotalsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = Category.objects.create(name='식비')
+        Budget.objects.create(user=self.user, category=self.food, amount=300000)
+        for days, amount, is_except in [(0, 1000, False), (0, 50000, True), (1, 2000, False), (1, 70000, True)]:
+            self.client.post('/api/expenditures/', {
+                'expense_date': (datetime.now() - timedelta(days=days)).isoformat(),
+                'expense_amount': amount,
+                'category': self.food.id,
+                'is_except': is_except,
+            }, format='json')
+
+    def test_aggregates_skip_excluded_spend(self):
+        expenditures = self.client.get('/api/expenditures/').data
+        self.assertEqual((expenditures['total_expense'], expenditures['total_excluded']), (3000, 120000))
+        self.assertEqual(expenditures['category_totals'][0]['category_total'], 3000)
+
+        noti = self.client.get('/api/expenditures/noti/').data
+        self.assertEqual(noti['today_total_amount'], 1000)
+        if datetime.now().day > 1:
+            self.assertEqual(noti['category_stats'][0]['today_expense_amount'], 3000)
+
+        today = datetime.now().date()
+        remaining_days = (today.replace(day=1) + timedelta(days=31) - today).days
+        self.assertEqual(recommend_today(self.user.pk)['total_recommendation'], round((300000 - 2000) / remaining_days))
+        self.assertEqual(build_statistics(self.user.pk)['total_this_month'], 3000 if datetime.now().day > 1 else 1000)
+
+    def test_partial_index(self):
+        if not connection.features.supports_partial_indexes:
+            self.skipTest('부분 인덱스 미지원')
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Expenditure._meta.db_table)
+        self.assertIn('expenditure_user_date_incl_idx', constraints)
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='식비')
+        Budget.objects.create(user=self.user, category=self.category, amount=300000)
+
+    def expend(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/expenditures/', {
+                'expense_date': datetime.now().isoformat(),
+                'expense_amount': 1000,
+                'category': self.category.id,
+            }, format='json')
+
+    def test_not_modified_until_user_writes(self):
+        for path in ['/api/expenditures/', '/api/expenditures/noti/']:
+            first = self.client.get(path)
+            self.assertEqual(first.status_code, 200)
+
+            # 변경이 없으면 DB 조회 없이 304
+            with self.assertNumQueries(0):
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], first['ETag'])
+
+            self.expend()
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_etag_varies_by_query_and_user(self):
+        etag = self.client.get('/api/expenditures/')['ETag']
+        self.assertNotEqual(self.client.get('/api/expenditures/?totals=false')['ETag'], etag)
+
+        other = User.objects.create_user(username='user2', password='devpassword1')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get('/api/expenditures/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_category_list(self):
+        first = self.client.get('/api/budgets//')
+        self.assertEqual(self.client.get('/api/budgets//', HTTP_IF_NONE_MATCH=f'W/{first["ETag"]}').status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/budgets//', {'name': '교통'}, format='json')
+        self.assertEqual(self.client.get('/api/budgets//', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+
+class SpendCounterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = Category.objects.create(name='식비')
+
+    def post(self, amount, is_except=False, expense_date=None):
+        return self.client.post('/api/expenditures/', {
+            'expense_date': (expense_date or datetime.now()).isoformat(),
+            'expense_amount': amount,
+            'category': self.food.id,
+            'is_except': is_except,
+        }, format='json').data
+
+    def counters(self):
+        self.user.refresh_from_db()
+        return self.user.total, self.user.month_total, self.user.month_total_month
+
+    def test_kept_current_on_writes(self):
+        first = self.post(10000)
+        self.post(5000, is_except=True)
+        self.post(7000, expense_date=datetime.now() - timedelta(days=40))
+        self.assertEqual(self.counters(), (17000, 10000, current_month()))
+
+        self.client.put(f'/api/expenditures/{first["id"]}/', {**first, 'expense_amount': 4000}, format='json')
+        self.assertEqual(self.counters(), (11000, 4000, current_month()))
+
+        self.client.put(f'/api/expenditures/{first["id"]}/', {**first, 'is_except': True}, format='json')
+        self.assertEqual(self.counters(), (7000, 0, current_month()))
+
+        self.client.delete(f'/api/expenditures/{first["id"]}/')
+        self.assertEqual(self.counters(), (7000, 0, current_month()))
+
+    def test_month_rollover(self):
+        self.post(10000)
+        User.objects.filter(pk=self.user.pk).update(month_total=99999, month_total_month=date(2000, 1, 1))
+
+        # 지난 달 카운터는 이번 달 집계에서 다시 시작
+        self.post(3000)
+        self.assertEqual(self.counters(), (13000, 13000, current_month()))
+
+    def test_statistics_reads_month_counter(self):
+        self.post(10000)
+        self.assertEqual(build_statistics(self.user.pk)['total_this_month'], 10000)
+
+        # 이번 달 총액은 일별 집계가 아니라 카운터에서 읽는다
+        User.objects.filter(pk=self.user.pk).update(month_total=12345)
+        self.assertEqual(build_statistics(self.user.pk)['total_this_month'], 12345)
+
+        # 카운터가 지난 달 값이면 일별 집계로 계산
+        User.objects.filter(pk=self.user.pk).update(month_total_month=date(2000, 1, 1))
+        self.assertEqual(build_statistics(self.user.pk)['total_this_month'], 10000)
+
+    def test_reconcile_repairs_drift(self):
+        self.post(10000)
+        other = User.objects.create_user(username='user2', password='devpassword1')
+        User.objects.filter(pk=self.user.pk).update(total=1, month_total=2)
+
+        out = io.StringIO()
+        call_command('reconcile_spend_counters', stdout=out)
+        self.assertIn('2건', out.getvalue())
+        self.assertEqual(self.counters(), (10000, 10000, current_month()))
+        self.assertEqual(reconcile_counters(), 0)
+
+        other.refresh_from_db()
+        self.assertEqual((other.total, other.month_total), (0, 0))
+
+
+class ExpenditureBatchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.other = User.objects.create_user(username='user2', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = Category.objects.create(name='식비')
+        self.transport = Category.objects.create(name='교통')
+        Budget.objects.create(user=self.user, category=self.food, amount=300000)
+
+        self.ids = [
+            self.expend(self.user, datetime.now() - timedelta(days=index % 3), 1000 * (index + 1)).id
+            for index in range(6)
+        ]
+        self.other_id = self.expend(self.other, datetime.now(), 5000).id
+
+    def expend(self, user, expense_date, amount):
+        expenditure = Expenditure.objects.create(user=user, category=self.food, expense_date=expense_date, expense_amount=amount)
+        rollups.add_expenditure(expenditure)
+        return expenditure
+
+    def derived(self):
+        # 집계 테이블, 이번 달 스냅샷, 유저 카운터
+        self.user.refresh_from_db()
+        return (
+            sorted(DailySpendRollup.objects.filter(user=self.user).values_list('category_id', 'day', 'total', 'count', 'excluded_total')),
+            sorted(MonthlyBudgetStatus.objects.filter(user=self.user).values_list('category_id', 'spent_to_date')),
+            (self.user.total, self.user.month_total),
+        )
+
+    def rebuilt(self):
+        current = self.derived()
+        rollups.rebuild_rollups(user=self.user)
+        expected = self.derived()
+        # 비어 있는 집계 행은 다시 만들면 사라지므로 비교에서 뺀다
+        return [row for row in current[0] if row[3]], current[1:], expected
+
+    def assertDerivedConsistent(self):
+        rollup_rows, rest, expected = self.rebuilt()
+        self.assertEqual(rollup_rows, expected[0])
+        self.assertEqual(rest, expected[1:])
+
+    def test_patch_by_ids(self):
+        old = datetime(2000, 1, 1)
+        Expenditure.objects.update(updated_at=old)
+        response = self.client.patch('/api/expenditures/batch/', {
+            'ids': self.ids[:4] + [self.other_id],
+            'category': self.transport.id,
+            'is_except': True,
+        }, format='json')
+        self.assertEqual(response.data, {'updated': 4})
+        self.assertEqual(Expenditure.objects.filter(category=self.transport).count(), 4)
+        self.assertEqual(Expenditure.objects.get(pk=self.other_id).category, self.food)
+        # 수정한 지출만 수정일시가 바뀐다
+        self.assertFalse(Expenditure.objects.filter(pk__in=self.ids[:4], updated_at=old).exists())
+        self.assertEqual(Expenditure.objects.filter(updated_at=old).count(), 3)
+        self.assertDerivedConsistent()
+
+    def test_patch_by_filter(self):
+        response = self.client.patch('/api/expenditures/batch/', {
+            'filter': {'min_amount': 3000, 'category_id': self.food.id},
+            'category': self.transport.id,
+        }, format='json')
+        self.assertEqual(response.data, {'updated': 4})
+        self.assertDerivedConsistent()
+
+    def test_patch_derives_deltas_without_rereading(self):
+        before = self.derived()
+        # 세이브포인트 + 수정 전 그룹 조회 + UPDATE (메모만 바꾸면 집계는 그대로)
+        with self.assertNumQueries(4):
+            rollups.update_expenditures(Expenditure.objects.filter(user=self.user), memo='정리')
+        self.assertEqual(self.derived(), before)
+
+        rollups.update_expenditures(Expenditure.objects.filter(pk__in=self.ids[:3]), is_except=True)
+        rollups.update_expenditures(Expenditure.objects.filter(pk__in=self.ids[1:3]), is_except=False, category=self.transport)
+        self.assertDerivedConsistent()
+
+    def test_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/expenditures/batch/', {
+                'filter': {'max_amount': 2000},
+            }, format='json')
+        self.assertEqual(response.data, {'deleted': 2})
+        self.assertEqual(Expenditure.objects.filter(user=self.user).count(), 4)
+        self.assertTrue(Expenditure.objects.filter(pk=self.other_id).exists())
+        self.assertDerivedConsistent()
+
+        response = self.client.delete('/api/expenditures/batch/', {'ids': self.ids}, format='json')
+        self.assertEqual(response.data, {'deleted': 4})
+        self.assertEqual(self.derived()[2], (0, 0))
+
+    def test_invalid_requests(self):
+        for data in [
+            {},
+            {'ids': [], 'is_except': True},
+            {'ids': self.ids, 'filter': {'category_id': 1}, 'is_except': True},
+            {'filter': {}, 'is_except': True},
+            {'filter': {'start_date': '11월'}, 'is_except': True},
+            {'filter': {'min_amount': 'abc'}, 'is_except': True},
+            {'filter': {'user_id': self.other.id}, 'is_except': True},
+            {'ids': self.ids},
+            {'ids': self.ids, 'expense_amount': 0},
+            {'ids': self.ids, 'category': 9999},
+        ]:
+            response = self.client.patch('/api/expenditures/batch/', data, format='json')
+            self.assertEqual(response.status_code, 400, data)
+        self.assertEqual(Expenditure.objects.filter(is_except=True).count(), 0)
+
+
+class ExpenditureModelTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.food = Category.objects.create(name='식비')
+
+    def test_save_sets_expense_day(self):
+        expenditure = Expenditure.objects.create(user=self.user, category=self.food, expense_date=datetime(2023, 11, 21, 23, 30), expense_amount=1000)
+        self.assertEqual(Expenditure.objects.get(pk=expenditure.pk).expense_day, date(2023, 11, 21))
+
+        # update_fields에 expense_date만 지정해도 expense_day를 함께 저장
+        expenditure.expense_date = datetime(2023, 11, 22, 0, 30)
+        expenditure.save(update_fields=['expense_date'])
+        self.assertEqual(Expenditure.objects.get(pk=expenditure.pk).expense_day, date(2023, 11, 22))
+
+        # date가 들어와도 그대로 사용
+        expenditure = Expenditure.objects.create(user=self.user, category=self.food, expense_date=date(2023, 11, 1), expense_amount=1000)
+        self.assertEqual(Expenditure.objects.get(pk=expenditure.pk).expense_day, date(2023, 11, 1))
+
+
+class ExpenditureDetailTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = Category.objects.create(name='식비')
+        self.transport = Category.objects.create(name='교통')
+
+    def post(self, amount, **data):
+        return self.client.post('/api/expenditures/', {
+            'expense_date': datetime.now().isoformat(),
+            'expense_amount': amount,
+            'category': self.food.id,
+            **data,
+        }, format='json').data
+
+    def rollup_rows(self):
+        return sorted(
+            DailySpendRollup.objects.filter(user=self.user, count__gt=0)
+                                    .values_list('category_id', 'day', 'total', 'count', 'excluded_total')
+        )
+
+    def assertRollupsMatchSource(self):
+        current = self.rollup_rows()
+        rollups.rebuild_rollups(user=self.user)
+        self.assertEqual(current, self.rollup_rows())
+
+    def test_writes_keep_rollups_consistent(self):
+        first = self.post(10000)
+        self.post(5000, is_except=True)
+        self.client.put(f'/api/expenditures/{first["id"]}/', {**first, 'category': self.transport.id, 'expense_amount': 7000}, format='json')
+        self.client.put(f'/api/expenditures/{first["id"]}/', {**first, 'expense_date': '2000-01-01T12:00:00'}, format='json')
+        self.assertEqual(Expenditure.objects.get(pk=first['id']).expense_day, date(2000, 1, 1))
+        self.assertRollupsMatchSource()
+
+        self.client.delete(f'/api/expenditures/{first["id"]}/')
+        self.assertRollupsMatchSource()
+
+    def test_double_delete_subtracts_once(self):
+        first = self.post(10000)
+        self.post(3000)
+
+        self.assertEqual(self.client.delete(f'/api/expenditures/{first["id"]}/').status_code, 204)
+        # 재시도된 요청은 집계를 다시 빼지 않는다
+        self.assertEqual(self.client.delete(f'/api/expenditures/{first["id"]}/').status_code, 404)
+        self.assertEqual(self.client.put(f'/api/expenditures/{first["id"]}/', first, format='json').status_code, 404)
+        self.assertEqual(self.rollup_rows()[0][2:], (3000, 1, 0))
+        self.assertRollupsMatchSource()
+
+    def test_scoped_to_requesting_user(self):
+        first = self.post(10000)
+        other = User.objects.create_user(username='user2', password='devpassword1')
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.client.get(f'/api/expenditures/{first["id"]}/').status_code, 404)
+        self.assertEqual(self.client.put(f'/api/expenditures/{first["id"]}/', first, format='json').status_code, 404)
+        self.assertEqual(self.client.delete(f'/api/expenditures/{first["id"]}/').status_code, 404)
+        self.assertTrue(Expenditure.objects.filter(pk=first['id']).exists())
+
+
+class SeedExpendituresTest(TestCase):
+    def seed(self, **options):
+        call_command('seed_expenditures', users=3, expenditures_per_user=20, days=30, base_date='2023-11-21', stdout=io.StringIO(), **options)
+        return list(
+            Expenditure.objects.filter(user__username__startswith='seed-user-')
+                               .order_by('user__username', 'expense_date', 'expense_amount')
+                               .values_list('user__username', 'category__name', 'expense_date', 'expense_amount', 'is_except')
+        )
+
+    def test_reproducible_and_scoped(self):
+        other = User.objects.create_user(username='other', password='devpassword1')
+        category = Category.objects.create(name='식비')
+        DailySpendRollup.objects.create(user=other, category=category, day=date(2023, 11, 1), total=999, count=1)
+
+        first = self.seed()
+        self.assertEqual(max(row[2] for row in first).date(), date(2023, 11, 21))
+        self.assertEqual(DailySpendRollup.objects.filter(user__username__startswith='seed-user-').aggregate(count=Sum('count'))['count'], 60)
+        # 생성하지 않은 유저의 집계는 다시 만들지 않는다
+        self.assertTrue(DailySpendRollup.objects.filter(user=other, total=999).exists())
+
+        # 다시 생성하면 기존 지출을 지우고 같은 데이터를 만든다
+        self.assertEqual(self.seed(), first)
+        self.assertEqual(DailySpendRollup.objects.filter(user__username__startswith='seed-user-').aggregate(count=Sum('count'))['count'], 60)
+
+
+class ExpenditureImportTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user1', password='devpassword1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = Category.objects.create(name='식비')
+
+    def rollups(self):
+        return list(DailySpendRollup.objects.filter(user=self.user).values_list('category_id', 'day', 'total', 'count', 'excluded_total'))
+
+    def test_json_rows(self):
+        version, = get_versions(user_version_key(self.user.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/expenditures/bulk/', [
+                {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 12000, 'category_name': '식비', 'memo': '점심'},
+                {'expense_date': '2023-11-21T18:00:00', 'expense_amount': 1400, 'category': self.food.id, 'is_except': True},
+            ], format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {'created': 2, 'errors': []})
+        self.assertEqual(self.rollups(), [(self.food.id, date(2023, 11, 21), 13400, 2, 1400)])
+        # bulk_create는 save()를 거치지 않으므로 expense_day를 직접 채운다
+        for expense_date, expense_day in Expenditure.objects.values_list('expense_date', 'expense_day'):
+            self.assertEqual(expense_day, expense_date.date())
+        # 등록한 유저의 응답 캐시 무효화
+        self.assertNotEqual(get_versions(user_version_key(self.user.pk)), [version])
+
+    def test_csv_rows(self):
+        body = (
+            'expense_date,expense_amount,category_name,memo,is_except\n'
+            '2023-11-21T12:00:00,12000,식비,점심,\n'
+            '2023-11-22T12:00:00,3000,식비,,true\n'
+        )
+        response = self.client.post('/api/expenditures/bulk/', body, content_type='text/csv')
+
+        self.assertEqual(response.data, {'created': 2, 'errors': []})
+        self.assertEqual(Expenditure.objects.get(expense_amount=12000).memo, '점심')
+        self.assertTrue(Expenditure.objects.get(expense_amount=3000).is_except)
+
+    def test_row_errors(self):
+        response = self.client.post('/api/expenditures/bulk/', [
+            {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 12000, 'category_name': '식비'},
+            {'expense_date': '어제', 'expense_amount': 1000, 'category_name': '식비'},
+            {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 1000, 'category_name': '없는 카테고리'},
+            {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 1000, 'category': 9999},
+            {'expense_date': '2023-11-21T12:00:00', 'expense_amount': -1, 'category_name': '식비'},
+            {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 1000},
+        ], format='json')
+
+        # 잘못된 행만 건너뛰고 행 번호와 함께 오류를 반환
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        errors = {error['row']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4, 5])
+        self.assertIn('expense_date', errors[1])
+        self.assertEqual(errors[2], {'category': ['존재하지 않는 카테고리입니다.']})
+        self.assertEqual(errors[3], {'category': ['존재하지 않는 카테고리입니다.']})
+        self.assertIn('expense_amount', errors[4])
+        self.assertEqual(self.rollups(), [(self.food.id, date(2023, 11, 21), 12000, 1, 0)])
+
+        response = self.client.post('/api/expenditures/bulk/', [{'expense_amount': 1000}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post('/api/expenditures/bulk/', {'expense_amount': 1000}, format='json').status_code, 400)
+
+    def test_amount_out_of_column_range(self):
+        # MySQL의 integer UNSIGNED 컬럼 범위를 모델 필드 검증으로 확인한다
+        field = Expenditure._meta.get_field('expense_amount')
+        with mock.patch.object(connection.ops, 'integer_field_range', return_value=(0, 4294967295)), \
+             mock.patch.dict(field.__dict__):
+            field.__dict__.pop('validators', None)
+            response = self.client.post('/api/expenditures/bulk/', [
+                {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 2 ** 40, 'category_name': '식비'},
+                {'expense_date': '2023-11-21T12:00:00', 'expense_amount': 4294967295, 'category_name': '식비'},
+            ], format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [0])
+        self.assertIn('expense_amount', response.data['errors'][0]['errors'])
+
+    def test_command_in_chunks(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8') as f:
+            f.write('expense_date,expense_amount,category_name\n')
+            for day in range(1, 6):
+                f.write(f'2023-11-{day:02d}T12:00:00,1000,식비\n')
+            f.write('2023-11-06T12:00:00,1000,없는 카테고리\n')
+            f.flush()
+
+            out, err = io.StringIO(), io.StringIO()
+            call_command('import_expenditures', f.name, user='user1', chunk_size=2, stdout=out, stderr=err)
+
+        self.assertIn('5건', out.getvalue())
+        self.assertIn('5행', err.getvalue())
+        self.assertEqual(len(self.rollups()), 5)
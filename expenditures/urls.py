@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.urls import path
-from expenditures import views
+from expenditures import async_views, views
 
 app_name = "expenditures"
 
 urlpatterns = [
-    path('', views.ExpenditureList.as_view()),
+    path('', async_views.expenditure_list if settings.ASYNC_VIEWS else views.ExpenditureList.as_view()),
+    path('bulk/', views.ExpenditureBulkImport.as_view()),
+    path('batch/', views.ExpenditureBatch.as_view()),
     path('<int:id>/', views.ExpenditureDetail.as_view()),
-    path('rec/', views.TodayRecommendation.as_view()),
-    path('noti/', views.NotiTodayExpenditure.as_view()),
+    path('rec/', async_views.today_recommendation if settings.ASYNC_VIEWS else views.TodayRecommendation.as_view()),
+    path('noti/', async_views.noti_today_expenditure if settings.ASYNC_VIEWS else views.NotiTodayExpenditure.as_view()),
     path('statistics/', views.Statistics.as_view()),
-]
\ No newline at end of file
+    path('series/', views.ExpenditureSeries.as_view()),
+    path('status/', views.BudgetStatusBatch.as_view()),
+]
@@ -1,311 +1,293 @@
-import random
-from faker import Faker
-from datetime import datetime, timedelta
-from django.db.models import Sum
-from django.utils.dateparse import parse_datetime
-from django.db.models.functions import ExtractDay, ExtractWeekDay
+import copy
+from datetime import datetime
+from operator import itemgetter
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-
-from budgets.models import Category, Budget
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAdminUser
+
+from budgets.registry import categories
+from config.cache import bump_user_version, cache_response, conditional_response
+from config.routers import use_replica
+from expenditures import budget_status, rollups
+from expenditures.filters import build_totals, category_totals_queryset, filter_expenditures, select_expenditures
+from expenditures.importer import import_expenditures
 from expenditures.models import Expenditure
-from expenditures.serializers import ExpenditureSerializer
-
-fake = Faker()
+from expenditures.pagination import KEYSET_ORDERING, get_page_size, paginate
+from expenditures.notifications import notify_today
+from expenditures.recommendations import recommend_today
+from expenditures.parsers import CSVParser
+from expenditures.series import build_series
+from expenditures.serializers import ExpenditureBatchUpdateSerializer, ExpenditureRowSerializer, ExpenditureSerializer, dumps
+from expenditures.statistics import build_statistics
 
 
 class ExpenditureList(APIView):
+    '''
+    🔗 url: /expenditures/
+    ✅ 지출 목록 조회 (키셋 페이지네이션)
+    - cursor: 이전 응답의 next_cursor
+    - page_size: 페이지 크기 (EXPENDITURE_MAX_PAGE_SIZE 이하)
+    - totals=false: 합계 계산 생략
+    - stream=ndjson: 전체 결과를 한 줄에 한 건씩 스트리밍
+    - If-None-Match: 지난 응답 이후 변경이 없으면 304
+    '''
+    # 등록 시 지출, 일별 집계, 예산 스냅샷, 유저 카운터 갱신 (월 첫 등록은 스냅샷 생성 포함)
+    query_budget = {'POST': 16}
+
+    @conditional_response('expenditures')
     def get(self, request):
-        # 기간 필터링
-        start_date_str = request.query_params.get('start_date', None)
-        end_date_str = request.query_params.get('end_date', None)
-
-        start_date = parse_datetime(start_date_str) if start_date_str else None
-        end_date = parse_datetime(end_date_str) if end_date_str else None
-
-        # 카테고리 필터링
-        category_id = request.query_params.get('category_id', None)
-        category_filter = {'category_id': category_id} if category_id else {}
-
-        # 최소, 최대 금액 필터링
-        min_amount = request.query_params.get('min_amount', None)
-        max_amount = request.query_params.get('max_amount', None)
-        amount_filter = {}
-        if min_amount:
-            amount_filter['expense_amount__gte'] = min_amount
-        if max_amount:
-            amount_filter['expense_amount__lte'] = max_amount
-
-        # 지출 목록 조회
-        expenditures = Expenditure.objects.filter(
-            user=request.user,
-            expense_date__range=(start_date, end_date),
-            **category_filter,
-            **amount_filter
-        )
+        expenditures = filter_expenditures(request.user.pk, request.query_params)
+        cursor = request.query_params.get('cursor', None)
+
+        # 합계는 첫 페이지에서만 한 번 계산
+        with_totals = request.query_params.get('totals', 'true').lower() != 'false' and not cursor
+        totals = build_totals(list(category_totals_queryset(expenditures))) if with_totals else None
+
+        if request.query_params.get('stream', None) == 'ndjson':
+            return self.stream_ndjson(expenditures, totals)
 
-        # 합계 계산
-        total_expense = expenditures.aggregate(Sum('expense_amount'))['expense_amount__sum']
-        category_totals = (
-            expenditures.values('category__name')
-                        .annotate(category_total=Sum('expense_amount'))
+        page, next_cursor = paginate(
+            ExpenditureRowSerializer.values(expenditures),
+            cursor,
+            get_page_size(request.query_params),
+            key=itemgetter(1, 0),
         )
 
         # 결과 반환
-        serializer = ExpenditureSerializer(expenditures, many=True)
+        serializer = ExpenditureRowSerializer(page)
         data = {
             'expenditures': serializer.data,
-            'total_expense': total_expense,
-            'category_totals': list(category_totals)
+            'next_cursor': next_cursor,
         }
+        if totals is not None:
+            data.update(totals)
 
         return Response(data)
 
+    def stream_ndjson(self, expenditures, totals):
+        # 결과 크기와 관계없이 메모리 사용량이 일정하도록 청크 단위로 읽어 한 줄씩 전송
+        def rows():
+            if totals is not None:
+                yield dumps(totals) + b'\n'
+            queryset = ExpenditureRowSerializer.values(expenditures.order_by(*KEYSET_ORDERING))
+            for row in queryset.iterator(chunk_size=settings.EXPENDITURE_STREAM_CHUNK_SIZE):
+                yield dumps(ExpenditureRowSerializer.to_representation(row)) + b'\n'
+
+        return StreamingHttpResponse(rows(), content_type='application/x-ndjson')
+
     def post(self, request):
         serializer = ExpenditureSerializer(data=request.data)
 
         if serializer.is_valid():
-            serializer.save(user=request.user)
+            with transaction.atomic():
+                expenditure = serializer.save(user_id=request.user.pk)
+                rollups.add_expenditure(expenditure)
+                bump_user_version(request.user.pk)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ExpenditureDetail(APIView):
-    def get_object(self, id):
-        try:
-            return Expenditure.objects.get(pk=id)
-        except Expenditure.DoesNotExist:
-            return None
+class ExpenditureBulkImport(APIView):
+    '''
+    🔗 url: /expenditures/bulk/
+    ✅ 지출 일괄 등록 (JSON 배열 또는 text/csv)
+    [
+        {"expense_date": "2023-11-21T12:00:00", "expense_amount": 12000, "category_name": "식비", "memo": "점심"},
+        {"expense_date": "2023-11-21T18:00:00", "expense_amount": 1400, "category": 2, "is_except": true}
+    ]
+    '''
+    parser_classes = [JSONParser, CSVParser]
+    # 쿼리 수가 (카테고리, 날짜) 수에 비례하므로 확인하지 않는다
+    query_budget = None
 
-    def get(self, request, id):
-        expenditure = self.get_object(id)
+    def post(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {'error': '지출 목록(배열)이 필요합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        if expenditure is not None:
-            serializer = ExpenditureSerializer(expenditure)
-            return Response(serializer.data)
+        result = import_expenditures(
+            request.user.pk,
+            request.data,
+            chunk_size=settings.EXPENDITURE_IMPORT_CHUNK_SIZE,
+        )
 
         return Response(
-            {'error': 'Expenditure not found'}, 
-            status=status.HTTP_404_NOT_FOUND
+            result.data,
+            status=status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST
         )
 
-    def put(self, request, id):
-        expenditure = self.get_object(id)
 
-        if expenditure is not None:
-            serializer = ExpenditureSerializer(expenditure, data=request.data)
+class ExpenditureBatch(APIView):
+    '''
+    🔗 url: /expenditures/batch/
+    ✅ 지출 일괄 수정(PATCH) / 삭제(DELETE)
+    대상은 ids 또는 filter(지출 목록 조회 조건)로 지정하고, 요청한 유저의 지출에만 적용된다.
+    {"ids": [1, 2, 3], "category": 2}
+    {"filter": {"start_date": "2023-11-01T00:00:00", "category_id": 1}, "is_except": true}
+    '''
+    # 쿼리 수가 대상 지출의 (카테고리, 날짜) 수에 비례하므로 확인하지 않는다
+    query_budget = None
+
+    def patch(self, request):
+        expenditures = select_expenditures(request.user.pk, request.data)
+        serializer = ExpenditureBatchUpdateSerializer(
+            data={key: value for key, value in request.data.items() if key not in ('ids', 'filter')},
+            partial=True,
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data)
+        with transaction.atomic():
+            updated = rollups.update_expenditures(expenditures, **serializer.validated_data)
+            bump_user_version(request.user.pk)
+        return Response({'updated': updated})
 
-            return Response(
-                serializer.errors, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    def delete(self, request):
+        expenditures = select_expenditures(request.user.pk, request.data)
 
-        return Response(
-            {'error': 'Expenditure not found'}, 
-            status=status.HTTP_404_NOT_FOUND
-        )
+        with transaction.atomic():
+            deleted = rollups.delete_expenditures(expenditures)
+            bump_user_version(request.user.pk)
+        return Response({'deleted': deleted})
 
-    def delete(self, request, id):
-        expenditure = self.get_object(id)
+
+class ExpenditureDetail(APIView):
+    # 수정은 이전 값을 빼고 새 값을 더하므로 집계 갱신이 두 번 일어난다
+    query_budget = {'PUT': 24, 'DELETE': 14}
+
+    def get_object(self, request, id, lock=False):
+        # 요청한 유저의 지출만 조회 (수정/삭제는 트랜잭션 안에서 행을 잠근다)
+        expenditures = Expenditure.objects.filter(user_id=request.user.pk)
+        if lock:
+            expenditures = expenditures.select_for_update()
+        return expenditures.filter(pk=id).first()
+
+    def get(self, request, id):
+        expenditure = self.get_object(request, id)
 
         if expenditure is not None:
-            expenditure.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+            serializer = ExpenditureSerializer(expenditure)
+            return Response(serializer.data)
 
         return Response(
             {'error': 'Expenditure not found'}, 
             status=status.HTTP_404_NOT_FOUND
         )
 
+    def put(self, request, id):
+        with transaction.atomic():
+            expenditure = self.get_object(request, id, lock=True)
 
-class TodayRecommendation(APIView):
-    def get(self, request, format=None):
-        # 오늘 지출 가능 금액 계산
-        today = datetime.now().date()
+            if expenditure is None:
+                return Response(
+                    {'error': 'Expenditure not found'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
 
-        # 월별 카테고리 예산 조회
-        categories = Category.objects.all()
-        category_budgets = {}
-        for category in categories:
-            category_budget = category.budget_set.filter(user=request.user).first()
-            if category_budget:
-                category_budgets[category.name] = category_budget.amount
-            else:
-                category_budgets[category.name] = 0
-
-        # 이전 일자의 과다 소비 고려하여 오늘 예산 계산
-        expenditures_before_today = Expenditure.objects.filter(
-            user=request.user,
-            expense_date__date__lt=today
-        )
-        total_expenditure_before_today = expenditures_before_today.aggregate(Sum('expense_amount'))['expense_amount__sum']
-
-        remaining_days = (today.replace(day=1) + timedelta(days=31) - today).days
-        remaining_budget = max(0, sum(category_budgets.values()) - total_expenditure_before_today)
-        daily_budget = remaining_budget / remaining_days if remaining_days > 0 else 0
-
-        # 카테고리 별 오늘 지출 가능 금액 계산
-        category_recommendations = {}
-        for category_name, category_budget in category_budgets.items():
-            category_expenditure_before_today = (
-                expenditures_before_today.filter(category__name=category_name)
-                                        .aggregate(Sum('expense_amount'))['expense_amount__sum'] or 0
-            )
-            category_remaining_budget = max(0, category_budget - category_expenditure_before_today)
-            category_daily_budget = category_remaining_budget / remaining_days if remaining_days > 0 else 0
-            category_recommendations[category_name] = round(category_daily_budget)
+            previous = copy.copy(expenditure)
+            serializer = ExpenditureSerializer(expenditure, data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    serializer.errors, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # 잠근 행이므로 UPDATE가 항상 한 행에 적용된다
+            serializer.save()
+            rollups.replace_expenditure(previous, expenditure)
+            bump_user_version(request.user.pk)
+        return Response(serializer.data)
 
-        # 메시지 생성
-        total_recommendation = round(daily_budget)
-        message = self.generate_recommendation_message(total_recommendation)
+    def delete(self, request, id):
+        with transaction.atomic():
+            expenditure = self.get_object(request, id, lock=True)
+            deleted = Expenditure.objects.filter(pk=id).delete()[0] if expenditure is not None else 0
 
-        # 결과 반환
-        result_data = {
-            'total_recommendation': total_recommendation,
-            'category_recommendations': category_recommendations,
-            'message': message
-        }
+            # 실제로 삭제된 경우에만 집계에서 뺀다 (중복/재시도 요청)
+            if not deleted:
+                return Response(
+                    {'error': 'Expenditure not found'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            rollups.remove_expenditure(expenditure)
+            bump_user_version(request.user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-        return Response(result_data)
 
-    def generate_recommendation_message(self, total_recommendation):
-        if total_recommendation == 0:
-            return "오늘은 예산을 모두 사용했어요. 다음에는 더 신중하게 사용해보세요!"
-        elif total_recommendation > 0 and total_recommendation <= 10000:
-            return "잘 아끼고 있을 때, 적당히 사용 중이시네요. 계속 이렇게 가세요!"
-        elif total_recommendation > 10000 and total_recommendation <= 20000:
-            return "기준을 조금 넘었을 때. 조금 더 절약해보는 건 어떨까요?"
-        else:
-            return "예산을 많이 초과하셨어요. 지출을 줄이는 노하우를 찾아보세요!"
+class TodayRecommendation(APIView):
+    @use_replica
+    @cache_response('recommendation')
+    def get(self, request, format=None):
+        # 오늘 지출 가능 금액 계산
+        result_data = recommend_today(request.user.pk)
+        return Response(result_data)
 
 
 class NotiTodayExpenditure(APIView):
+    @conditional_response('noti')
+    @use_replica
+    @cache_response('noti')
     def get(self, request):
-        # 오늘 지출한 내역 조회
-        today = datetime.now().date()
-        expenditures_today = Expenditure.objects.filter(
-            user=request.user,
-            expense_date__date=today
-        )
-        today_total_amount = expenditures_today.aggregate(Sum('expense_amount'))['expense_amount__sum']
+        # 오늘 지출 합계와 카테고리 별 위험도 계산
+        result_data = notify_today(request.user.pk)
+        return Response(result_data)
 
-        # 월별 카테고리 통계 조회
-        month_start = today.replace(day=1)
-        expenditures_month = Expenditure.objects.filter(
-            user=request.user,
-            expense_date__date__gte=month_start
-        )
 
-        # 카테고리 별 지출 합계 계산
-        category_totals = (
-            expenditures_month.values('category__name')
-                            .annotate(category_total=Sum('expense_amount'))
-        )
+class Statistics(APIView):
+    @use_replica
+    @cache_response('statistics')
+    def get(self, request):
+        # 지난 달 대비 총액, 카테고리 별 소비율, 지난 요일 / 다른 유저 대비 소비율
+        result_data = build_statistics(request.user.pk)
+        return Response(result_data)
 
-        # 카테고리별 예산 조회 및 계산
-        categories = Category.objects.all()
-        category_stats = []
-        for category in categories:
-            category_budget = category.budget_set.filter(user=request.user).first()
-            category_total_amount = next(
-                (item['category_total'] for item in category_totals if item['category__name'] == category.name),
-                0
-            )
-            if category_budget:
-                today_appropriate_amount = category_budget.amount * today.day / month_start.days_in_month
-                danger_percentage = (category_total_amount - today_appropriate_amount) / today_appropriate_amount * 100
-            else:
-                today_appropriate_amount = 0
-                danger_percentage = 0
-
-            category_stat = {
-                'category_name': category.name,
-                'today_appropriate_amount': today_appropriate_amount,
-                'today_expense_amount': category_total_amount,
-                'danger_percentage': danger_percentage
-            }
-            category_stats.append(category_stat)
-
-        result_data = {
-            'today_total_amount': today_total_amount,
-            'category_stats': category_stats
-        }
 
+class ExpenditureSeries(APIView):
+    '''
+    🔗 url: /expenditures/series/
+    ✅ 구간별(day/week/month) 지출 합계 (차트용)
+    - interval, start_date, end_date, split=category, include_except=true
+    '''
+    def get(self, request):
+        result_data = build_series(request.user.pk, request.query_params)
         return Response(result_data)
 
 
-class Statistics(APIView):
-    def generate_dummy_data(self, user, num_entries=30):
-        # 더미 데이터 생성
-        categories = Category.objects.all()
-        for _ in range(num_entries):
-            date = fake.date_this_month()
-            category = random.choice(categories)
-            amount = random.randint(1000, 50000)
-            Expenditure.objects.create(
-                expense_date=date,
-                expense_amount=amount,
-                user=user,
-                category=category
-            )
+class BudgetStatusBatch(APIView):
+    '''
+    🔗 url: /expenditures/status/?user_ids=1,2,3
+    ✅ 여러 유저의 이번 달 카테고리 별 예산 스냅샷 조회 (관리자 전용, 알림 발송용)
+    '''
+    permission_classes = [IsAdminUser]
+    requires_full_user = True
 
     def get(self, request):
-        # 더미 데이터 생성 (실제 서비스에서는 필요 없음)
-        self.generate_dummy_data(request.user)
-
-        # 지난 달 대비 총액 및 카테고리 별 소비율
-        last_month_start = fake.date_this_month().replace(day=1) - timedelta(days=1)
-        last_month_end = fake.date_this_month().replace(day=1) - timedelta(days=1)
-        expenditures_last_month = Expenditure.objects.filter(
-            user=request.user,
-            expense_date__range=(last_month_start, last_month_end)
-        )
-        total_last_month = expenditures_last_month.aggregate(Sum('expense_amount'))['expense_amount__sum']
-
-        category_ratios = {}
-        for category in Category.objects.all():
-            category_amount = expenditures_last_month.filter(category=category).aggregate(Sum('expense_amount'))['expense_amount__sum'] or 0
-            if total_last_month > 0:
-                category_ratio = (category_amount / total_last_month) * 100
-            else:
-                category_ratio = 0
-            category_ratios[category.name] = round(category_ratio, 2)
-
-        # 지난 요일 대비 소비율
-        today = fake.date_this_month()
-        weekday = today.weekday()
-        expenditures_last_weekday = Expenditure.objects.filter(
-            user=request.user,
-            expense_date__week_day=weekday
-        )
-        total_last_weekday = expenditures_last_weekday.aggregate(Sum('expense_amount'))['expense_amount__sum'] or 0
-
-        last_weekday_ratio = 0
-        if total_last_weekday > 0:
-            last_weekday_ratio = (total_last_weekday / total_last_month) * 100
-
-        # 다른 유저 대비 소비율
-        total_users = 3  # (3명의 유저인 경우)
-        total_expenditure_other_users = Expenditure.objects.exclude(user=request.user).aggregate(Sum('expense_amount'))['expense_amount__sum'] or 0
-        total_expenditure_avg = total_expenditure_other_users / total_users
-        user_expenditure = expenditures_last_month.aggregate(Sum('expense_amount'))['expense_amount__sum'] or 0
-
-        other_users_ratio = 0
-        if total_expenditure_avg > 0:
-            other_users_ratio = (user_expenditure / total_expenditure_avg) * 100
-
-        result_data = {
-            'total_last_month': total_last_month,
-            'category_ratios': category_ratios,
-            'last_weekday_ratio': round(last_weekday_ratio, 2),
-            'other_users_ratio': round(other_users_ratio, 2)
-        }
+        try:
+            user_ids = sorted({int(user_id) for user_id in request.query_params.get('user_ids', '').split(',') if user_id})
+        except ValueError:
+            return Response({'error': 'user_ids는 쉼표로 구분한 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not user_ids or len(user_ids) > budget_status.MAX_BATCH_USERS:
+            return Response(
+                {'error': f'user_ids는 1개 이상 {budget_status.MAX_BATCH_USERS}개 이하여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        return Response(result_data)
\ No newline at end of file
+        today = datetime.now().date()
+        category_names = categories.names()
+        statuses = budget_status.get_statuses(user_ids, today.replace(day=1))
+        return Response({
+            'month': today.strftime('%Y-%m'),
+            'users': {
+                user_id: budget_status.status_rows(user_statuses, category_names, today)
+                for user_id, user_statuses in statuses.items()
+            },
+        })